@@ -0,0 +1,97 @@
+"""
+Benchmark: per-request CPU spent turning Mongo documents into JSON for the
+list endpoints, comparing the old path (hand-built models + FastAPI's
+response_model validation + json.dumps) with the TypeAdapter/bytes path.
+
+Usage: python bench_serialization.py [documents_per_response] [iterations]
+No database is needed; documents are synthesized in the stored shape.
+"""
+import os
+import sys
+import json
+import time
+from datetime import datetime, timezone, timedelta
+from typing import List
+
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "bench")
+
+from pydantic import TypeAdapter
+from fastapi.encoders import jsonable_encoder
+
+from server import (
+    EventResponse, RegistrationResponse, NotificationResponse, GalleryImageResponse,
+    event_list_adapter, registration_list_adapter, notification_list_adapter, gallery_list_adapter,
+    serialize,
+)
+
+def iso(offset_minutes: int) -> str:
+    return (datetime(2026, 1, 24, tzinfo=timezone.utc) + timedelta(minutes=offset_minutes)).isoformat()
+
+def make_events(n):
+    return [{
+        "id": f"technology-anwesh-event-{i}", "name": f"Event {i}", "description": "Lorem ipsum " * 20,
+        "sub_fest": "TECHNOLOGY-ANWESH", "event_type": "team", "coordinators": ["A", "B"],
+        "timing": "10AM", "venue": "W103", "registration_deadline": iso(i), "capacity": 100,
+        "registered_count": i % 100, "is_active": True, "is_registration_open": True,
+        "min_team_size": 2, "max_team_size": 4, "max_events_per_student": 3,
+        "rulebooks": [{"title": "Rules", "url": "https://example.com/api/files/file-1", "file_id": "file-1"}],
+        "created_at": iso(i),
+    } for i in range(n)]
+
+def make_registrations(n):
+    return [{
+        "id": f"reg-{i:016x}", "event_id": "technology-anwesh-robotics", "student_email": f"s{i}@example.com",
+        "registered_at": iso(i), "event_name": "Robotics", "sub_fest": "TECHNOLOGY-ANWESH",
+        "full_name": "Student", "roll_number": f"2026CS{i:03d}", "department": "CSE", "year": 2,
+        "mobile_number": "9876543210", "selected_sub_events": ["Line Follower"],
+    } for i in range(n)]
+
+def make_notifications(n):
+    return [{"id": f"notif-{i}", "title": "Update", "message": "Message " * 10, "image_url": None, "created_at": iso(i)} for i in range(n)]
+
+def make_gallery(n):
+    return [{"id": f"img-{i}", "sub_fest": "CULTURAL-AKANKSHA", "image_url": "https://example.com/x.jpg", "caption": "c", "uploaded_at": iso(i)} for i in range(n)]
+
+def old_path(model, date_fields, docs):
+    # What the handlers did before: parse timestamps, build models by hand,
+    # then FastAPI dumps, re-validates against response_model and json-encodes.
+    adapter = TypeAdapter(List[model])
+    models = []
+    for doc in docs:
+        doc = dict(doc)
+        for field in date_fields:
+            if isinstance(doc.get(field), str):
+                doc[field] = datetime.fromisoformat(doc[field])
+        models.append(model(**doc))
+    validated = adapter.validate_python([m.model_dump() for m in models])
+    return json.dumps(jsonable_encoder(adapter.dump_python(validated, mode="json"))).encode()
+
+def new_path(adapter, docs):
+    return serialize(adapter, docs)
+
+def cpu_per_call(fn, iterations):
+    fn()
+    start = time.process_time()
+    for _ in range(iterations):
+        fn()
+    return (time.process_time() - start) / iterations * 1000
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    cases = [
+        ("GET /api/events", EventResponse, ["registration_deadline", "created_at"], event_list_adapter, make_events(n)),
+        ("GET /api/registrations/my", RegistrationResponse, ["registered_at"], registration_list_adapter, make_registrations(n)),
+        ("GET /api/notifications", NotificationResponse, ["created_at"], notification_list_adapter, make_notifications(n)),
+        ("GET /api/gallery", GalleryImageResponse, ["uploaded_at"], gallery_list_adapter, make_gallery(n)),
+    ]
+    print(f"{n} documents per response, {iterations} iterations (CPU ms per request)")
+    print(f"{'endpoint':<28}{'before':>10}{'after':>10}{'speedup':>10}")
+    for name, model, date_fields, adapter, docs in cases:
+        before = cpu_per_call(lambda: old_path(model, date_fields, docs), iterations)
+        after = cpu_per_call(lambda: new_path(adapter, docs), iterations)
+        print(f"{name:<28}{before:>10.2f}{after:>10.2f}{before / after:>9.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import logging
+import os
+from datetime import datetime, timezone
+from pymongo import UpdateOne
+
+# Conversion of timestamps stored as ISO strings into BSON dates. Shared by
+# the migrate_datetimes.py CLI and the server's startup migration, so this
+# module only defines things; it reads no required settings and does no I/O
+# on import.
+logger = logging.getLogger(__name__)
+
+# Timestamp fields that used to be stored as ISO strings
+DATETIME_FIELDS = {
+    "users": ["created_at"],
+    "events": ["created_at", "registration_deadline"],
+    "registrations": ["registered_at"],
+    "notifications": ["created_at"],
+    "gallery": ["uploaded_at"],
+    "shortlists": ["uploaded_at"],
+    "files": ["uploaded_at"],
+    "password_resets": ["expires_at", "created_at"],
+    "email_outbox": ["created_at", "next_attempt_at", "claimed_at", "sent_at"],
+}
+
+BATCH_SIZE = int(os.getenv("MIGRATION_BATCH_SIZE", "500"))
+CHECKPOINT = {"name": "iso_strings_to_dates"}
+
+def parse(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+async def pending_collections(db) -> list:
+    done = await db.migrations.distinct("collection", {**CHECKPOINT, "completed_at": {"$exists": True}})
+    return [collection for collection in DATETIME_FIELDS if collection not in done]
+
+async def migrate_collection(db, collection: str, fields: list) -> int:
+    # Progress is checkpointed per collection by _id, so an interrupted run
+    # resumes where it stopped; the $type filter makes re-runs idempotent.
+    state = await db.migrations.find_one({**CHECKPOINT, "collection": collection}) or {}
+    last_id = state.get("last_id")
+    converted = 0
+
+    while True:
+        query = {"$or": [{field: {"$type": "string"}} for field in fields]}
+        if last_id is not None:
+            query["_id"] = {"$gt": last_id}
+        batch = await db[collection].find(query, {field: 1 for field in fields}).sort("_id", 1).limit(BATCH_SIZE).to_list(BATCH_SIZE)
+        if not batch:
+            break
+
+        ops = []
+        for doc in batch:
+            updates = {}
+            for field in fields:
+                if isinstance(doc.get(field), str):
+                    try:
+                        updates[field] = parse(doc[field])
+                    except ValueError:
+                        logger.warning(f"Skipping unparseable {collection}.{field} on {doc['_id']}: {doc[field]!r}")
+            if updates:
+                ops.append(UpdateOne({"_id": doc["_id"]}, {"$set": updates}))
+
+        if ops:
+            result = await db[collection].bulk_write(ops, ordered=False)
+            converted += result.modified_count
+
+        last_id = batch[-1]["_id"]
+        await db.migrations.update_one(
+            {**CHECKPOINT, "collection": collection},
+            {"$set": {"last_id": last_id, "updated_at": datetime.now(timezone.utc)}},
+            upsert=True
+        )
+        logger.info(f"{collection}: {converted} documents converted so far")
+
+    await db.migrations.update_one(
+        {**CHECKPOINT, "collection": collection},
+        {"$set": {"completed_at": datetime.now(timezone.utc)}, "$unset": {"last_id": ""}},
+        upsert=True
+    )
+    return converted
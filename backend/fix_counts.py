@@ -1,7 +1,7 @@
-
 import asyncio
 import os
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -19,27 +19,29 @@ async def fix_counts():
     
     print("Starting registration count sync...")
     
-    # Get all events
-    events = await db.events.find({}).to_list(None)
-    print(f"Found {len(events)} events.")
+    # Count actual registrations for every event in one pass
+    actual = {
+        doc["_id"]: doc["count"]
+        async for doc in db.registrations.aggregate([{"$group": {"_id": "$event_id", "count": {"$sum": 1}}}])
+    }
     
-    updated_count = 0
+    events = await db.events.find({}, {"_id": 0, "id": 1, "name": 1, "sub_fest": 1, "registered_count": 1}).to_list(None)
+    print(f"Found {len(events)} events.")
     
+    ops = []
     for event in events:
         event_id = event['id']
         current_count = event.get('registered_count', 0)
-        
-        # Count actual registrations
-        actual_count = await db.registrations.count_documents({"event_id": event_id})
+        actual_count = actual.get(event_id, 0)
         
         if current_count != actual_count:
             print(f"Mismatch for {event['sub_fest']} - {event['name']} ({event_id}): stored={current_count}, actual={actual_count}")
-            
-            await db.events.update_one(
-                {"id": event_id},
-                {"$set": {"registered_count": actual_count}}
-            )
-            updated_count += 1
+            ops.append(UpdateOne({"id": event_id}, {"$set": {"registered_count": actual_count}}))
+    
+    updated_count = 0
+    if ops:
+        result = await db.events.bulk_write(ops, ordered=False)
+        updated_count = result.modified_count
             
     print(f"Sync complete. Updated {updated_count} events.")
     client.close()
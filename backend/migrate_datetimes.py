@@ -0,0 +1,32 @@
+import asyncio
+import logging
+import os
+import sys
+from motor.motor_asyncio import AsyncIOMotorClient
+from dotenv import load_dotenv
+from datetime_migration import DATETIME_FIELDS, migrate_collection
+
+load_dotenv()
+
+MONGO_URL = os.getenv("MONGO_URL")
+DB_NAME = os.getenv("DB_NAME")
+
+async def migrate():
+    client = AsyncIOMotorClient(MONGO_URL, tz_aware=True)
+    db = client[DB_NAME]
+
+    collections = sys.argv[1:] or list(DATETIME_FIELDS)
+    print(f"Converting ISO string timestamps to BSON dates in: {', '.join(collections)}")
+
+    for collection in collections:
+        converted = await migrate_collection(db, collection, DATETIME_FIELDS[collection])
+        print(f"✅ {collection}: converted {converted} documents.")
+
+    client.close()
+
+if __name__ == "__main__":
+    if not MONGO_URL or not DB_NAME:
+        print("Please set MONGO_URL and DB_NAME environment variables.")
+        exit(1)
+    logging.basicConfig(level=logging.INFO, format="  %(message)s")
+    asyncio.run(migrate())
@@ -32,7 +32,7 @@ EVENTS = [
         "coordinators": ["TBD"],
         "timing": "9th-10th Feb 2026",
         "venue": "Sports Ground",
-        "registration_deadline": "2026-02-08T23:59:59",
+        "registration_deadline": datetime(2026, 2, 8, 23, 59, 59, tzinfo=timezone.utc),
         "max_events_per_student": 4
     },
     {
@@ -45,7 +45,7 @@ EVENTS = [
         "coordinators": ["TBD"],
         "timing": "9th-10th Feb 2026",
         "venue": "Sports Ground",
-        "registration_deadline": "2026-02-08T23:59:59",
+        "registration_deadline": datetime(2026, 2, 8, 23, 59, 59, tzinfo=timezone.utc),
         "max_events_per_student": 4
     },
     {
@@ -58,7 +58,7 @@ EVENTS = [
         "coordinators": ["TBD"],
         "timing": "9th-10th Feb 2026",
         "venue": "Sports Ground",
-        "registration_deadline": "2026-02-08T23:59:59",
+        "registration_deadline": datetime(2026, 2, 8, 23, 59, 59, tzinfo=timezone.utc),
         "max_events_per_student": 4
     },
     {
@@ -71,7 +71,7 @@ EVENTS = [
         "coordinators": ["TBD"],
         "timing": "9th-10th Feb 2026",
         "venue": "Sports Ground",
-        "registration_deadline": "2026-02-08T23:59:59",
+        "registration_deadline": datetime(2026, 2, 8, 23, 59, 59, tzinfo=timezone.utc),
         "max_events_per_student": 4
     },
     {
@@ -84,7 +84,7 @@ EVENTS = [
         "coordinators": ["TBD"],
         "timing": "9th-10th Feb 2026",
         "venue": "Sports Ground",
-        "registration_deadline": "2026-02-08T23:59:59",
+        "registration_deadline": datetime(2026, 2, 8, 23, 59, 59, tzinfo=timezone.utc),
         "max_events_per_student": 4
     },
     {
@@ -97,7 +97,7 @@ EVENTS = [
         "coordinators": ["TBD"],
         "timing": "9th-10th Feb 2026",
         "venue": "Sports Ground",
-        "registration_deadline": "2026-02-08T23:59:59",
+        "registration_deadline": datetime(2026, 2, 8, 23, 59, 59, tzinfo=timezone.utc),
         "max_events_per_student": 4
     },
     {
@@ -110,7 +110,7 @@ EVENTS = [
         "coordinators": ["TBD"],
         "timing": "9th-10th Feb 2026",
         "venue": "Sports Ground",
-        "registration_deadline": "2026-02-08T23:59:59",
+        "registration_deadline": datetime(2026, 2, 8, 23, 59, 59, tzinfo=timezone.utc),
         "max_events_per_student": 4
     },
     {
@@ -123,7 +123,7 @@ EVENTS = [
         "coordinators": ["TBD"],
         "timing": "9th-10th Feb 2026",
         "venue": "Sports Ground",
-        "registration_deadline": "2026-02-08T23:59:59",
+        "registration_deadline": datetime(2026, 2, 8, 23, 59, 59, tzinfo=timezone.utc),
         "max_events_per_student": 4
     },
     {
@@ -136,7 +136,7 @@ EVENTS = [
         "coordinators": ["TBD"],
         "timing": "9th-10th Feb 2026",
         "venue": "Sports Ground",
-        "registration_deadline": "2026-02-08T23:59:59",
+        "registration_deadline": datetime(2026, 2, 8, 23, 59, 59, tzinfo=timezone.utc),
         "max_events_per_student": 4
     },
 
@@ -151,7 +151,7 @@ EVENTS = [
         "coordinators": ["TBD"],
         "timing": "9th-10th Feb 2026",
         "venue": "Sports Ground",
-        "registration_deadline": "2026-02-08T23:59:59",
+        "registration_deadline": datetime(2026, 2, 8, 23, 59, 59, tzinfo=timezone.utc),
         "max_events_per_student": 4
     },
     {
@@ -164,7 +164,7 @@ EVENTS = [
         "coordinators": ["TBD"],
         "timing": "9th-10th Feb 2026",
         "venue": "Sports Ground",
-        "registration_deadline": "2026-02-08T23:59:59",
+        "registration_deadline": datetime(2026, 2, 8, 23, 59, 59, tzinfo=timezone.utc),
         "max_events_per_student": 4
     },
     {
@@ -177,7 +177,7 @@ EVENTS = [
         "coordinators": ["TBD"],
         "timing": "9th-10th Feb 2026",
         "venue": "Sports Ground",
-        "registration_deadline": "2026-02-08T23:59:59",
+        "registration_deadline": datetime(2026, 2, 8, 23, 59, 59, tzinfo=timezone.utc),
         "max_events_per_student": 4
     },
     {
@@ -190,7 +190,7 @@ EVENTS = [
         "coordinators": ["TBD"],
         "timing": "9th-10th Feb 2026",
         "venue": "Sports Ground",
-        "registration_deadline": "2026-02-08T23:59:59",
+        "registration_deadline": datetime(2026, 2, 8, 23, 59, 59, tzinfo=timezone.utc),
         "max_events_per_student": 4
     },
     {
@@ -203,7 +203,7 @@ EVENTS = [
         "coordinators": ["TBD"],
         "timing": "9th-10th Feb 2026",
         "venue": "Sports Ground",
-        "registration_deadline": "2026-02-08T23:59:59",
+        "registration_deadline": datetime(2026, 2, 8, 23, 59, 59, tzinfo=timezone.utc),
         "max_events_per_student": 4
     },
     {
@@ -216,7 +216,7 @@ EVENTS = [
         "coordinators": ["TBD"],
         "timing": "9th-10th Feb 2026",
         "venue": "Sports Ground",
-        "registration_deadline": "2026-02-08T23:59:59",
+        "registration_deadline": datetime(2026, 2, 8, 23, 59, 59, tzinfo=timezone.utc),
         "max_events_per_student": 4
     },
     {
@@ -229,7 +229,7 @@ EVENTS = [
         "coordinators": ["TBD"],
         "timing": "9th-10th Feb 2026",
         "venue": "Sports Ground",
-        "registration_deadline": "2026-02-08T23:59:59",
+        "registration_deadline": datetime(2026, 2, 8, 23, 59, 59, tzinfo=timezone.utc),
         "max_events_per_student": 4
     }
 ]
@@ -249,7 +249,7 @@ async def seed_events():
         # Preserve existing fields if updating, or defaults
         event_doc['registered_count'] = 0 
         event_doc['is_active'] = True
-        event_doc['created_at'] = datetime.now(timezone.utc).isoformat()
+        event_doc['created_at'] = datetime.now(timezone.utc)
         
         # Use update_one with upsert to avoid duplicates but update content
         # Note: This resets registered_count if we are not careful. 
@@ -25,7 +25,7 @@ events_data = [
         "timing": "10th Feb 2026, 10:00 AM",
         "venue": "Workshop",
         "capacity": 30,
-        "registration_deadline": "2026-02-09T23:59:59"
+        "registration_deadline": datetime(2026, 2, 9, 23, 59, 59, tzinfo=timezone.utc)
     },
     {
         "name": "BRIDGE DESIGNING",
@@ -38,7 +38,7 @@ events_data = [
         "timing": "10th Feb 2026, 11:00 AM",
         "venue": "Civil Block",
         "capacity": 40,
-        "registration_deadline": "2026-02-09T23:59:59"
+        "registration_deadline": datetime(2026, 2, 9, 23, 59, 59, tzinfo=timezone.utc)
     },
     {
         "name": "CIRCUIT DESIGNING",
@@ -51,7 +51,7 @@ events_data = [
         "timing": "10th Feb 2026, 02:00 PM",
         "venue": "Electronics Lab",
         "capacity": 40,
-        "registration_deadline": "2026-02-09T23:59:59"
+        "registration_deadline": datetime(2026, 2, 9, 23, 59, 59, tzinfo=timezone.utc)
     },
     {
         "name": "MATH OLYMPIAD",
@@ -64,7 +64,7 @@ events_data = [
         "timing": "11th Feb 2026, 10:00 AM",
         "venue": "Exam Hall",
         "capacity": 100,
-        "registration_deadline": "2026-02-09T23:59:59"
+        "registration_deadline": datetime(2026, 2, 9, 23, 59, 59, tzinfo=timezone.utc)
     },
     {
         "name": "QUIZ",
@@ -77,7 +77,7 @@ events_data = [
         "timing": "11th Feb 2026, 02:00 PM",
         "venue": "Auditorium",
         "capacity": 50,
-        "registration_deadline": "2026-02-09T23:59:59"
+        "registration_deadline": datetime(2026, 2, 9, 23, 59, 59, tzinfo=timezone.utc)
     },
     {
         "name": "FUN WITH CODING",
@@ -90,7 +90,7 @@ events_data = [
         "timing": "10th Feb 2026, 10:00 AM",
         "venue": "Computer Center",
         "capacity": 100,
-        "registration_deadline": "2026-02-09T23:59:59"
+        "registration_deadline": datetime(2026, 2, 9, 23, 59, 59, tzinfo=timezone.utc)
     },
     {
         "name": "JAM",
@@ -103,7 +103,7 @@ events_data = [
         "timing": "11th Feb 2026, 11:00 AM",
         "venue": "Seminar Hall",
         "capacity": 60,
-        "registration_deadline": "2026-02-09T23:59:59"
+        "registration_deadline": datetime(2026, 2, 9, 23, 59, 59, tzinfo=timezone.utc)
     },
     {
         "name": "FACE PAINTING",
@@ -116,7 +116,7 @@ events_data = [
         "timing": "10th Feb 2026, 03:00 PM",
         "venue": "Main Garden",
         "capacity": 30,
-        "registration_deadline": "2026-02-09T23:59:59"
+        "registration_deadline": datetime(2026, 2, 9, 23, 59, 59, tzinfo=timezone.utc)
     },
     {
         "name": "RANGOLI",
@@ -129,7 +129,7 @@ events_data = [
         "timing": "11th Feb 2026, 09:00 AM",
         "venue": "Main Corridor",
         "capacity": 30,
-        "registration_deadline": "2026-02-09T23:59:59"
+        "registration_deadline": datetime(2026, 2, 9, 23, 59, 59, tzinfo=timezone.utc)
     },
     {
         "name": "FUN EVENTS ON STAGE",
@@ -142,7 +142,7 @@ events_data = [
         "timing": "11th Feb 2026, 04:00 PM",
         "venue": "Open Air Stage",
         "capacity": 200,
-        "registration_deadline": "2026-02-09T23:59:59"
+        "registration_deadline": datetime(2026, 2, 9, 23, 59, 59, tzinfo=timezone.utc)
     },
     {
         "name": "POSTER PAINTING",
@@ -155,7 +155,7 @@ events_data = [
         "timing": "10th Feb 2026, 11:00 AM",
         "venue": "Drawing Hall",
         "capacity": 50,
-        "registration_deadline": "2026-02-09T23:59:59"
+        "registration_deadline": datetime(2026, 2, 9, 23, 59, 59, tzinfo=timezone.utc)
     },
     {
         "name": "ROBOTICS",
@@ -168,7 +168,7 @@ events_data = [
         "timing": "11th Feb 2026, 02:00 PM",
         "venue": "Robotics Lab",
         "capacity": 40,
-        "registration_deadline": "2026-02-09T23:59:59"
+        "registration_deadline": datetime(2026, 2, 9, 23, 59, 59, tzinfo=timezone.utc)
     }
 ]
 
@@ -186,7 +186,7 @@ async def seed_events():
         event_doc['id'] = event_id
         event_doc['registered_count'] = 0
         event_doc['is_active'] = True
-        event_doc['created_at'] = datetime.now(timezone.utc).isoformat()
+        event_doc['created_at'] = datetime.now(timezone.utc)
         event_doc['max_events_per_student'] = 3
         
         await db.events.update_one(
@@ -1,24 +1,48 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, status, UploadFile, File, Query, Response, Form
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, status, Query, Response, Request
+from fastapi.responses import ORJSONResponse, StreamingResponse, FileResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorGridFSBucket
+from gridfs.errors import NoFile
+from pymongo import ReturnDocument, UpdateOne, DeleteMany
+from pymongo.errors import DuplicateKeyError, BulkWriteError, OperationFailure, PyMongoError
+from python_multipart.multipart import MultipartParser, parse_options_header
 import os
 import logging
 from pathlib import Path
-from pydantic import BaseModel, Field, EmailStr, ConfigDict, field_validator
+from pydantic import BaseModel, Field, EmailStr, ConfigDict, field_validator, TypeAdapter
+import orjson
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timezone, timedelta
 import jwt
 from passlib.context import CryptContext
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import openpyxl
 import io
-from io import BytesIO
 import csv
+import tempfile
 import secrets
-import resend
+import hmac
+import hashlib
+import httpx
+import html
+import json
+import smtplib
+from email.message import EmailMessage
+from string import Template
+from abc import ABC, abstractmethod
 import re
+from urllib.parse import quote
+import time
+import asyncio
+from collections import OrderedDict, deque
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime_migration import DATETIME_FIELDS, CHECKPOINT as DATETIME_MIGRATION, migrate_collection, pending_collections
 
 logging.basicConfig(
     level=logging.INFO,
@@ -40,9 +64,94 @@ db_name = os.getenv("DB_NAME")
 if not mongo_url or not db_name:
     raise RuntimeError("❌ MONGO_URL or DB_NAME missing in environment")
 
-client = AsyncIOMotorClient(mongo_url)
+# Timestamps are stored as native BSON dates; tz_aware returns them as UTC-aware datetimes
+client = AsyncIOMotorClient(mongo_url, tz_aware=True)
 db = client[db_name]
 
+# Indexes the application relies on, created idempotently at startup by
+# bootstrap_indexes(). Each entry is (collection, keys, unique).
+REQUIRED_INDEXES = [
+    ("users", [("email", 1)], True),
+    ("users", [("roll_number", 1)], True),
+    ("events", [("id", 1)], True),
+    ("events", [("is_active", 1), ("sub_fest", 1)], False),
+    ("registrations", [("id", 1)], True),
+    ("registrations", [("event_id", 1), ("student_email", 1)], True),
+    ("registrations", [("student_email", 1), ("sub_fest", 1)], False),
+    # Keyset pagination of the admin list, kept to two indexes because
+    # registrations is the hottest write path: event_id pages are a range
+    # scan of their own index; sub_fest, department and year have a handful
+    # of values each, so those filters walk the (registered_at, _id) index
+    # in order and skip non-matching entries, without an in-memory sort
+    ("registrations", [("registered_at", 1), ("_id", 1)], False),
+    ("registrations", [("event_id", 1), ("registered_at", 1), ("_id", 1)], False),
+    ("registration_quotas", [("student_email", 1), ("sub_fest", 1)], True),
+    ("event_counters", [("event_id", 1), ("gen", 1), ("slot", 1)], True),
+    ("files", [("id", 1)], True),
+    ("shortlists", [("id", 1)], True),
+    ("shortlists", [("uploaded_at", -1)], False),
+    ("password_resets", [("token", 1)], True),
+    ("password_resets", [("email", 1)], False),
+    ("system", [("type", 1)], True),
+    ("export_versions", [("type", 1)], True),
+    ("notifications", [("id", 1)], True),
+    ("notifications", [("created_at", -1), ("id", -1)], False),
+    ("gallery", [("sub_fest", 1)], False),
+    ("email_outbox", [("id", 1)], True),
+    ("email_outbox", [("status", 1), ("next_attempt_at", 1)], False),
+    ("email_outbox", [("claim", 1)], False),
+    ("email_budget", [("window", 1)], True),
+    ("migrations", [("name", 1), ("collection", 1)], True),
+]
+# Indexes an earlier version created and no longer needs; dropped at startup
+RETIRED_INDEXES = [
+    ("registrations", [("sub_fest", 1), ("registered_at", 1), ("_id", 1)]),
+    ("registrations", [("department", 1), ("year", 1), ("registered_at", 1), ("_id", 1)]),
+    ("registrations", [("year", 1), ("registered_at", 1), ("_id", 1)]),
+    ("event_counters", [("event_id", 1), ("slot", 1)]),
+]
+index_status: Dict[str, dict] = {}
+
+def index_label(collection: str, keys: list) -> str:
+    return f"{collection}." + ",".join(f"{field}:{direction}" for field, direction in keys)
+
+async def bootstrap_indexes():
+    for collection, keys, unique in REQUIRED_INDEXES:
+        label = index_label(collection, keys)
+        entry = {"collection": collection, "keys": keys, "unique": unique}
+        try:
+            existing = await db[collection].index_information()
+            match = next((info for info in existing.values() if list(info["key"]) == keys), None)
+            if match is None:
+                logger.warning(f"Index {label} missing, creating it")
+                await db[collection].create_index(keys, unique=unique)
+                entry["status"] = "created"
+            elif bool(match.get("unique")) != unique:
+                logger.error(f"Index {label} exists with unique={bool(match.get('unique'))}, expected unique={unique}")
+                entry["status"] = "mismatched"
+            else:
+                entry["status"] = "ok"
+        except Exception as e:
+            # Typically existing duplicate values blocking a unique index
+            logger.error(f"Could not create index {label}: {e}")
+            entry["status"] = "failed"
+            entry["error"] = str(e)
+        index_status[label] = entry
+    
+    for collection, keys in RETIRED_INDEXES:
+        try:
+            existing = await db[collection].index_information()
+            for name, info in existing.items():
+                if list(info["key"]) == keys:
+                    await db[collection].drop_index(name)
+                    logger.info(f"Dropped retired index {index_label(collection, keys)}")
+        except Exception as e:
+            logger.warning(f"Could not drop retired index {index_label(collection, keys)}: {e}")
+
+def unique_index_ready(collection: str, keys: list) -> bool:
+    entry = index_status.get(index_label(collection, keys))
+    return bool(entry) and entry["status"] in ("ok", "created")
+
 # Security
 JWT_SECRET = os.environ.get('JWT_SECRET', 'utsah-secret-key-2026-fest-gita-college')
 JWT_ALGORITHM = 'HS256'
@@ -52,13 +161,31 @@ security = HTTPBearer()
 # Resend Email Configuration (for password reset)
 RESEND_API_KEY = os.environ.get('RESEND_API_KEY', '')
 FRONTEND_URL = os.environ.get('FRONTEND_URL', 'http://localhost:3000')
-if RESEND_API_KEY:
-    resend.api_key = RESEND_API_KEY
+
+# Email outbox: handlers enqueue into db.email_outbox and a background worker
+# delivers in batches. EMAIL_TRANSPORT is "resend", "smtp" or "file" (writes
+# each message as JSON into EMAIL_FILE_DIR, handy for local runs and tests).
+EMAIL_FROM = os.environ.get('EMAIL_FROM', 'UTSAH Fest <noreply@utsahfest.in>')
+EMAIL_TRANSPORT = os.environ.get('EMAIL_TRANSPORT', 'resend' if RESEND_API_KEY else 'file')
+EMAIL_FILE_DIR = Path(os.environ.get('EMAIL_FILE_DIR', str(ROOT_DIR / 'outbox')))
+SMTP_HOST = os.environ.get('SMTP_HOST', 'localhost')
+SMTP_PORT = int(os.environ.get('SMTP_PORT', '1025'))
+EMAIL_OUTBOX_WORKER = os.environ.get('EMAIL_OUTBOX_WORKER', '1') == '1'
+EMAIL_BATCH_SIZE = min(int(os.environ.get('EMAIL_BATCH_SIZE', '50')), 100)  # Resend batch API caps at 100
+EMAIL_SEND_PER_MINUTE = int(os.environ.get('EMAIL_SEND_PER_MINUTE', '100'))
+EMAIL_MAX_ATTEMPTS = int(os.environ.get('EMAIL_MAX_ATTEMPTS', '6'))
+EMAIL_RETRY_BASE_SECONDS = float(os.environ.get('EMAIL_RETRY_BASE_SECONDS', '30'))
+EMAIL_POLL_INTERVAL = float(os.environ.get('EMAIL_POLL_INTERVAL', '5'))
+
+# Password reset tokens: "signed" issues stateless HMAC tokens bound to the
+# user's current password hash; "db" keeps the legacy password_resets collection.
+RESET_TOKEN_MODE = os.environ.get('RESET_TOKEN_MODE', 'signed')
+RESET_TOKEN_TTL = timedelta(hours=1)
 
 from fastapi.middleware.gzip import GZipMiddleware
 
 # Create the main app without a prefix
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
 app.add_middleware(GZipMiddleware, minimum_size=1000)
 
 @app.get("/health")
@@ -77,6 +204,7 @@ app.add_middleware(
     ],
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Sync-Token", "Link"],
 )
 
 # Create a router with the /api prefix
@@ -89,12 +217,189 @@ def hash_password(password: str) -> str:
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
+# bcrypt blocks for 100-300 ms per call, so it runs on a dedicated pool instead
+# of the event loop. bcrypt releases the GIL, so threads give real parallelism.
+# When more than PASSWORD_POOL_MAX_QUEUE calls are already waiting we answer
+# 503 instead of letting a login storm pile up unbounded work.
+PASSWORD_POOL_WORKERS = int(os.environ.get('PASSWORD_POOL_WORKERS', str(min(4, os.cpu_count() or 1))))
+PASSWORD_POOL_MAX_QUEUE = int(os.environ.get('PASSWORD_POOL_MAX_QUEUE', '64'))
+password_executor = ThreadPoolExecutor(max_workers=PASSWORD_POOL_WORKERS, thread_name_prefix="bcrypt")
+password_pool_stats = {"queued": 0, "running": 0, "completed": 0, "rejected": 0, "max_queue_seen": 0}
+password_pool_lock = threading.Lock()
+
+async def run_password_job(func, *args):
+    if password_pool_stats["queued"] + password_pool_stats["running"] >= PASSWORD_POOL_WORKERS + PASSWORD_POOL_MAX_QUEUE:
+        password_pool_stats["rejected"] += 1
+        raise HTTPException(
+            status_code=503,
+            detail="Server is busy, please try again in a few seconds",
+            headers={"Retry-After": "2"}
+        )
+
+    def job():
+        with password_pool_lock:
+            password_pool_stats["queued"] -= 1
+            password_pool_stats["running"] += 1
+        try:
+            return func(*args)
+        finally:
+            with password_pool_lock:
+                password_pool_stats["running"] -= 1
+                password_pool_stats["completed"] += 1
+
+    with password_pool_lock:
+        password_pool_stats["queued"] += 1
+        password_pool_stats["max_queue_seen"] = max(password_pool_stats["max_queue_seen"], password_pool_stats["queued"])
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_executor, job)
+
+async def hash_password_async(password: str) -> str:
+    return await run_password_job(hash_password, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await run_password_job(verify_password, plain_password, hashed_password)
+
+# bcrypt cost is calibrated at startup against the container's CPU: the highest
+# cost whose hash time stays within BCRYPT_TARGET_MS, never below the
+# BCRYPT_MIN_ROUNDS security floor. Set BCRYPT_ROUNDS to pin a fixed cost.
+BCRYPT_TARGET_MS = float(os.environ.get('BCRYPT_TARGET_MS', '250'))
+BCRYPT_MIN_ROUNDS = int(os.environ.get('BCRYPT_MIN_ROUNDS', '10'))
+BCRYPT_MAX_ROUNDS = int(os.environ.get('BCRYPT_MAX_ROUNDS', '14'))
+BCRYPT_ROUNDS = os.environ.get('BCRYPT_ROUNDS')
+bcrypt_calibration = {
+    "rounds": None,
+    "target_ms": BCRYPT_TARGET_MS,
+    "min_rounds": BCRYPT_MIN_ROUNDS,
+    "max_rounds": BCRYPT_MAX_ROUNDS,
+    "timings_ms": {},
+    "calibrated_at": None,
+    "rehashed_on_login": 0,
+}
+background_tasks = set()
+
+def time_bcrypt_hash(rounds: int) -> float:
+    start = time.perf_counter()
+    bcrypt.hashpw(b"utsah-calibration", bcrypt.gensalt(rounds))
+    return (time.perf_counter() - start) * 1000
+
+def calibrate_bcrypt_rounds() -> int:
+    timings = {}
+    if BCRYPT_ROUNDS:
+        rounds = max(int(BCRYPT_ROUNDS), BCRYPT_MIN_ROUNDS)
+        timings[rounds] = time_bcrypt_hash(rounds)
+    else:
+        rounds = BCRYPT_MIN_ROUNDS
+        elapsed = timings[rounds] = time_bcrypt_hash(rounds)
+        # Each extra round doubles the work, so stop once the next one would overshoot
+        while rounds < BCRYPT_MAX_ROUNDS and elapsed * 2 <= BCRYPT_TARGET_MS:
+            rounds += 1
+            elapsed = timings[rounds] = time_bcrypt_hash(rounds)
+        if elapsed > BCRYPT_TARGET_MS and rounds > BCRYPT_MIN_ROUNDS:
+            rounds -= 1
+
+    # min_rounds makes needs_update() flag only hashes weaker than the chosen
+    # cost. There is deliberately no max: workers that calibrate a round apart
+    # must not rehash each other's users back and forth, and a stronger
+    # stored hash is never downgraded.
+    pwd_context.update(bcrypt__default_rounds=rounds, bcrypt__min_rounds=rounds)
+    bcrypt_calibration.update({
+        "rounds": rounds,
+        "timings_ms": {str(r): round(ms, 1) for r, ms in timings.items()},
+        "calibrated_at": datetime.now(timezone.utc).isoformat(),
+    })
+    logger.info(f"bcrypt cost calibrated to {rounds} rounds (timings ms: {bcrypt_calibration['timings_ms']})")
+    return rounds
+
+async def rehash_password(email: str, plain_password: str, old_hash: str):
+    try:
+        new_hash = await hash_password_async(plain_password)
+        # Only replace the hash we verified, so a concurrent reset is never undone
+        result = await db.users.update_one({"email": email, "password": old_hash}, {"$set": {"password": new_hash}})
+        if result.modified_count:
+            bcrypt_calibration["rehashed_on_login"] += 1
+            user_cache.invalidate(email)
+    except Exception as e:
+        logger.warning(f"Background rehash failed for {email}: {e}")
+
+def schedule_background(coro):
+    task = asyncio.create_task(coro)
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+    return task
+
 def create_token(data: dict, expires_delta: timedelta = timedelta(days=7)) -> str:
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + expires_delta
     to_encode.update({"exp": expire})
     return jwt.encode(to_encode, JWT_SECRET, algorithm=JWT_ALGORITHM)
 
+# In-process cache of authenticated users, keyed by the JWT `sub` (email).
+# Entries expire after USER_CACHE_TTL seconds so out-of-process edits
+# (seed/cleanup scripts) are picked up without a restart.
+USER_CACHE_TTL = float(os.environ.get('USER_CACHE_TTL', '60'))
+USER_CACHE_SIZE = int(os.environ.get('USER_CACHE_SIZE', '5000'))
+
+class UserCache:
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[dict]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return dict(entry[1])
+
+    def set(self, key: str, user: dict):
+        if self.maxsize <= 0 or self.ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, dict(user))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: str):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+        }
+
+user_cache = UserCache(USER_CACHE_SIZE, USER_CACHE_TTL)
+
+def reset_signing_key(password_hash: str) -> str:
+    # Keyed on the current hash, so the token dies as soon as the password changes
+    return hmac.new(JWT_SECRET.encode(), password_hash.encode(), hashlib.sha256).hexdigest()
+
+def create_reset_token(user: dict) -> str:
+    payload = {
+        "sub": user['email'],
+        "purpose": "password_reset",
+        "exp": datetime.now(timezone.utc) + RESET_TOKEN_TTL,
+    }
+    return jwt.encode(payload, reset_signing_key(user['password']), algorithm=JWT_ALGORITHM)
+
+def is_signed_reset_token(token: str) -> bool:
+    return token.count('.') == 2
+
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     token = credentials.credentials
     try:
@@ -103,9 +408,12 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
         role = payload.get("role")
         if not email:
             raise HTTPException(status_code=401, detail="Invalid token")
-        user = await db.users.find_one({"email": email}, {"_id": 0})
-        if not user:
-            raise HTTPException(status_code=401, detail="User not found")
+        user = user_cache.get(email)
+        if user is None:
+            user = await db.users.find_one({"email": email}, {"_id": 0})
+            if not user:
+                raise HTTPException(status_code=401, detail="User not found")
+            user_cache.set(email, user)
         return user
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token expired")
@@ -113,10 +421,72 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
         raise HTTPException(status_code=401, detail="Invalid token")
 
 async def get_admin_user(user: dict = Depends(get_current_user)):
+    # Role comes from the (usually cached) user document, so admin checks
+    # don't cost an extra database round trip.
     if user.get("role") != "admin":
         raise HTTPException(status_code=403, detail="Admin access required")
     return user
 
+# Conditional responses for the public read endpoints. Serialized payloads are
+# cached with a content-hash ETag, so a matching If-None-Match is answered with
+# 304 before any database query, serialization or gzip pass. Writes invalidate
+# the affected keys; PUBLIC_CACHE_TTL bounds staleness across workers and
+# PUBLIC_CACHE_SIZE the number of payloads kept.
+PUBLIC_CACHE_TTL = float(os.environ.get('PUBLIC_CACHE_TTL', '30'))
+PUBLIC_CACHE_SIZE = int(os.environ.get('PUBLIC_CACHE_SIZE', '256'))
+PUBLIC_CACHE_CONTROL = os.environ.get('PUBLIC_CACHE_CONTROL', 'public, max-age=0, must-revalidate')
+
+def make_etag(payload: bytes) -> str:
+    return '"' + hashlib.blake2b(payload, digest_size=16).hexdigest() + '"'
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [c.strip() for c in header.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+def conditional_json(request: Request, payload: bytes, etag: str) -> Response:
+    headers = {"ETag": etag, "Cache-Control": PUBLIC_CACHE_CONTROL}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=payload, media_type="application/json", headers=headers)
+
+class PayloadCache:
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[tuple]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[1], entry[2]
+
+    def set(self, key: str, payload: bytes) -> tuple:
+        etag = make_etag(payload)
+        self._entries[key] = (time.monotonic() + self.ttl, payload, etag)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return payload, etag
+
+    def invalidate(self, prefix: str):
+        for key in [k for k in self._entries if k == prefix or k.startswith(prefix + ":")]:
+            del self._entries[key]
+
+public_cache = PayloadCache(PUBLIC_CACHE_SIZE, PUBLIC_CACHE_TTL)
+
+async def cached_json(request: Request, key: str, loader) -> Response:
+    cached = public_cache.get(key)
+    if cached is None:
+        cached = public_cache.set(key, await loader())
+    return conditional_json(request, *cached)
+
 # Models
 class UserRegister(BaseModel):
     full_name: str
@@ -279,45 +649,299 @@ class ResetPasswordRequest(BaseModel):
     token: str
     new_password: str
 
+# Hot-path serializers. Handlers validate raw Mongo documents once through a
+# precompiled TypeAdapter (which also parses ISO timestamps) and write JSON
+# bytes directly, bypassing FastAPI's second response_model pass.
+event_list_adapter = TypeAdapter(List[EventResponse])
+registration_list_adapter = TypeAdapter(List[RegistrationResponse])
+notification_list_adapter = TypeAdapter(List[NotificationResponse])
+gallery_list_adapter = TypeAdapter(List[GalleryImageResponse])
+
+def serialize(adapter: TypeAdapter, data: Any) -> bytes:
+    return adapter.dump_json(adapter.validate_python(data))
+
+def json_bytes_response(content: bytes, status_code: int = 200) -> Response:
+    return Response(content=content, status_code=status_code, media_type="application/json")
+
+def token_response(token: str, user: dict) -> Response:
+    return json_bytes_response(TokenResponse(token=token, user=UserResponse.model_validate(user)).model_dump_json().encode())
+
+def user_response(user: dict) -> Response:
+    return json_bytes_response(UserResponse.model_validate(user).model_dump_json().encode())
+
+def as_datetime(value) -> Optional[datetime]:
+    # Values written before the startup timestamp migration ran may still be
+    # ISO strings; parse them the way the migration does
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if isinstance(value, datetime) and value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value if isinstance(value, datetime) else None
+
+def as_text(value) -> Optional[str]:
+    return None if value is None else str(value)
+
+# Email outbox
+RESET_EMAIL_TEMPLATE = Template("""
+<div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto; padding: 20px;">
+    <div style="background: linear-gradient(135deg, #d946ef 0%, #ec4899 100%); padding: 30px; border-radius: 10px 10px 0 0;">
+        <h1 style="color: white; margin: 0; text-align: center;">UTSAH 2026</h1>
+    </div>
+    <div style="background: #1a1a2e; padding: 30px; border-radius: 0 0 10px 10px; color: #eee;">
+        <h2 style="color: #d946ef;">Password Reset Request</h2>
+        <p>Hi $full_name,</p>
+        <p>We received a request to reset your password. Click the button below to create a new password:</p>
+        <div style="text-align: center; margin: 30px 0;">
+            <a href="$reset_link" style="background: linear-gradient(135deg, #d946ef 0%, #ec4899 100%); color: white; padding: 15px 30px; text-decoration: none; border-radius: 5px; font-weight: bold; display: inline-block;">Reset Password</a>
+        </div>
+        <p style="color: #888; font-size: 14px;">This link will expire in 1 hour.</p>
+        <p style="color: #888; font-size: 14px;">If you didn't request this, you can safely ignore this email.</p>
+        <hr style="border: 1px solid #333; margin: 20px 0;">
+        <p style="color: #666; font-size: 12px; text-align: center;">UTSAH - Annual College Fest | GITA Autonomous College</p>
+    </div>
+</div>
+""")
+
+class EmailTransport(ABC):
+    @abstractmethod
+    async def send_batch(self, messages: List[dict]):
+        ...
+
+    async def close(self):
+        pass
+
+class ResendTransport(EmailTransport):
+    def __init__(self, api_key: str):
+        self.client = httpx.AsyncClient(
+            base_url="https://api.resend.com",
+            headers={"Authorization": f"Bearer {api_key}"},
+            timeout=httpx.Timeout(15.0),
+            limits=httpx.Limits(max_connections=4, max_keepalive_connections=4),
+        )
+
+    async def send_batch(self, messages: List[dict]):
+        payload = [{"from": m['from'], "to": m['to'], "subject": m['subject'], "html": m['html']} for m in messages]
+        response = await self.client.post("/emails/batch", json=payload)
+        response.raise_for_status()
+
+    async def close(self):
+        await self.client.aclose()
+
+class SMTPTransport(EmailTransport):
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+
+    def _send(self, messages: List[dict]):
+        with smtplib.SMTP(self.host, self.port, timeout=15) as smtp:
+            for m in messages:
+                msg = EmailMessage()
+                msg['From'] = m['from']
+                msg['To'] = ", ".join(m['to'])
+                msg['Subject'] = m['subject']
+                msg.set_content(m['html'], subtype="html")
+                smtp.send_message(msg)
+
+    async def send_batch(self, messages: List[dict]):
+        await asyncio.to_thread(self._send, messages)
+
+class FileTransport(EmailTransport):
+    def __init__(self, directory: Path):
+        self.directory = directory
+
+    def _write(self, messages: List[dict]):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for m in messages:
+            (self.directory / f"{m['id']}.json").write_text(json.dumps(m, default=str, indent=2))
+
+    async def send_batch(self, messages: List[dict]):
+        await asyncio.to_thread(self._write, messages)
+        logger.info(f"Wrote {len(messages)} outbox email(s) to {self.directory}")
+
+def build_email_transport() -> EmailTransport:
+    if EMAIL_TRANSPORT == "resend":
+        return ResendTransport(RESEND_API_KEY)
+    if EMAIL_TRANSPORT == "smtp":
+        return SMTPTransport(SMTP_HOST, SMTP_PORT)
+    # Outgoing mail includes live reset tokens, so writing it to disk is only
+    # meant for local runs
+    if not FRONTEND_URL.startswith(("http://localhost", "http://127.0.0.1")):
+        logger.warning(
+            f"EMAIL_TRANSPORT is 'file' outside local development (FRONTEND_URL={FRONTEND_URL}); "
+            f"emails, including password reset links, are written to {EMAIL_FILE_DIR} instead of being sent. "
+            "Set RESEND_API_KEY or EMAIL_TRANSPORT=smtp."
+        )
+    return FileTransport(EMAIL_FILE_DIR)
+
+email_outbox_wakeup = asyncio.Event()
+email_outbox_stats = {"transport": EMAIL_TRANSPORT, "sent": 0, "retried": 0, "failed": 0, "batches": 0}
+
+async def enqueue_email(to: str, subject: str, html_body: str):
+    now = datetime.now(timezone.utc)
+    await db.email_outbox.insert_one({
+        "id": f"mail-{secrets.token_hex(8)}",
+        "from": EMAIL_FROM,
+        "to": [to],
+        "subject": subject,
+        "html": html_body,
+        "status": "pending",
+        "attempts": 0,
+        "next_attempt_at": now,
+        "created_at": now
+    })
+    email_outbox_wakeup.set()
+
+# EMAIL_SEND_PER_MINUTE is shared by every worker: sends are counted per
+# clock minute in db.email_budget, and a worker reserves from that count
+# before claiming messages.
+def email_budget_window() -> int:
+    return int(time.time() // 60)
+
+async def email_budget_remaining() -> int:
+    doc = await db.email_budget.find_one({"window": email_budget_window()}, {"_id": 0, "sent": 1})
+    return max(EMAIL_SEND_PER_MINUTE - (doc or {}).get("sent", 0), 0)
+
+async def reserve_email_budget(wanted: int) -> int:
+    window = email_budget_window()
+    try:
+        doc = await db.email_budget.find_one_and_update(
+            {"window": window},
+            {"$inc": {"sent": wanted}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+    except DuplicateKeyError:
+        return 0  # Another worker opened this minute at the same moment; retry on the next poll
+    granted = max(min(wanted, EMAIL_SEND_PER_MINUTE - (doc["sent"] - wanted)), 0)
+    if granted < wanted:
+        await release_email_budget(window, wanted - granted)
+    if doc["sent"] == wanted:
+        # First reservation this minute; drop the old windows
+        await db.email_budget.delete_many({"window": {"$lt": window}})
+    return granted
+
+async def release_email_budget(window: int, unused: int):
+    if unused > 0:
+        await db.email_budget.update_one({"window": window}, {"$inc": {"sent": -unused}})
+
+async def claim_outbox_batch(limit: int) -> List[dict]:
+    now = datetime.now(timezone.utc)
+    # Release claims left behind by a worker that died mid-send
+    await db.email_outbox.update_many(
+        {"status": "sending", "claimed_at": {"$lt": now - timedelta(minutes=5)}},
+        {"$set": {"status": "pending"}}
+    )
+    candidates = await db.email_outbox.find(
+        {"status": "pending", "next_attempt_at": {"$lte": now}},
+        {"_id": 0, "id": 1}
+    ).sort("next_attempt_at", 1).limit(limit).to_list(limit)
+    if not candidates:
+        return []
+    window = email_budget_window()
+    granted = await reserve_email_budget(len(candidates))
+    if not granted:
+        return []
+
+    # Claim with a unique marker so two workers never send the same message
+    claim = secrets.token_hex(8)
+    await db.email_outbox.update_many(
+        {"id": {"$in": [c['id'] for c in candidates[:granted]]}, "status": "pending"},
+        {"$set": {"status": "sending", "claim": claim, "claimed_at": now}}
+    )
+    batch = await db.email_outbox.find({"claim": claim, "status": "sending"}, {"_id": 0}).to_list(limit)
+    # Hand back budget for messages another worker claimed first
+    await release_email_budget(window, granted - len(batch))
+    return batch
+
+async def deliver_outbox_batch(transport: EmailTransport, batch: List[dict]):
+    email_outbox_stats["batches"] += 1
+    try:
+        await transport.send_batch(batch)
+    except Exception as e:
+        logger.error(f"Email batch of {len(batch)} failed: {e}")
+        now = datetime.now(timezone.utc)
+        for m in batch:
+            attempts = m.get('attempts', 0) + 1
+            if attempts >= EMAIL_MAX_ATTEMPTS:
+                update = {"status": "failed"}
+                email_outbox_stats["failed"] += 1
+            else:
+                delay = min(EMAIL_RETRY_BASE_SECONDS * 2 ** (attempts - 1), 3600)
+                update = {"status": "pending", "next_attempt_at": now + timedelta(seconds=delay)}
+                email_outbox_stats["retried"] += 1
+            await db.email_outbox.update_one(
+                {"id": m['id']},
+                {"$set": {**update, "attempts": attempts, "last_error": str(e)[:500]}, "$unset": {"claim": ""}}
+            )
+        return
+
+    # Sent messages keep their metadata but not the body, which may hold a
+    # password reset link
+    await db.email_outbox.update_many(
+        {"id": {"$in": [m['id'] for m in batch]}},
+        {"$set": {"status": "sent", "sent_at": datetime.now(timezone.utc)}, "$unset": {"claim": "", "html": ""}}
+    )
+    email_outbox_stats["sent"] += len(batch)
+
+async def email_outbox_worker():
+    transport = build_email_transport()
+    try:
+        while True:
+            email_outbox_wakeup.clear()
+            try:
+                batch = await claim_outbox_batch(EMAIL_BATCH_SIZE)
+                if batch:
+                    await deliver_outbox_batch(transport, batch)
+                    continue
+            except Exception as e:
+                logger.error(f"Email outbox worker error: {e}")
+            try:
+                await asyncio.wait_for(email_outbox_wakeup.wait(), timeout=EMAIL_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        await transport.close()
+
 # Auth endpoints
 @api_router.post("/auth/register", response_model=TokenResponse)
 async def register(user_data: UserRegister):
-    # Check if user exists
-    existing = await db.users.find_one({"email": user_data.email}, {"_id": 0})
-    if existing:
-        raise HTTPException(status_code=400, detail="Email already registered")
-    
-    existing_roll = await db.users.find_one({"roll_number": user_data.roll_number}, {"_id": 0})
-    if existing_roll:
-        raise HTTPException(status_code=400, detail="Roll number already registered")
+    # With the unique indexes in place, duplicates surface as DuplicateKeyError
+    # on insert; the pre-reads are only a fallback when an index is missing
+    if not unique_index_ready("users", [("email", 1)]):
+        existing = await db.users.find_one({"email": user_data.email}, {"_id": 1})
+        if existing:
+            raise HTTPException(status_code=400, detail="Email already registered")
+    
+    if not unique_index_ready("users", [("roll_number", 1)]):
+        existing_roll = await db.users.find_one({"roll_number": user_data.roll_number}, {"_id": 1})
+        if existing_roll:
+            raise HTTPException(status_code=400, detail="Roll number already registered")
     
     # Create user
     try:
         user_dict = user_data.model_dump()
-        user_dict['password'] = hash_password(user_data.password)
+        user_dict['password'] = await hash_password_async(user_data.password)
         user_dict['role'] = 'student'
         user_dict['verified'] = True  # Mock email verification
-        user_dict['created_at'] = datetime.now(timezone.utc).isoformat()
+        user_dict['created_at'] = datetime.now(timezone.utc)
         user_dict['id'] = user_data.email
         
-        await db.users.insert_one(user_dict)
+        try:
+            await db.users.insert_one(user_dict)
+        except DuplicateKeyError as e:
+            if "roll_number" in (e.details or {}).get("keyPattern", {}):
+                raise HTTPException(status_code=400, detail="Roll number already registered")
+            raise HTTPException(status_code=400, detail="Email already registered")
         
         # Create token
         token = create_token({"sub": user_data.email, "role": "student"})
         
-        user_response = UserResponse(
-            email=user_dict['email'],
-            full_name=user_dict['full_name'],
-            roll_number=user_dict['roll_number'],
-            department=user_dict['department'],
-            year=user_dict['year'],
-            mobile_number=user_dict['mobile_number'],
-            role=user_dict['role'],
-            verified=user_dict['verified'],
-            created_at=datetime.fromisoformat(user_dict['created_at'])
-        )
-        
-        return TokenResponse(token=token, user=user_response)
+        return token_response(token, user_dict)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Registration error: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
@@ -325,27 +949,18 @@ async def register(user_data: UserRegister):
 @api_router.post("/auth/login", response_model=TokenResponse)
 async def login(credentials: UserLogin):
     user = await db.users.find_one({"email": credentials.email}, {"_id": 0})
-    if not user or not verify_password(credentials.password, user['password']):
+    if not user or not await verify_password_async(credentials.password, user['password']):
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
     if not user.get('verified'):
         raise HTTPException(status_code=401, detail="Email not verified")
     
-    token = create_token({"sub": user['email'], "role": user['role']})
+    if pwd_context.needs_update(user['password']):
+        schedule_background(rehash_password(user['email'], credentials.password, user['password']))
     
-    user_response = UserResponse(
-        email=user['email'],
-        full_name=user['full_name'],
-        roll_number=user['roll_number'],
-        department=user['department'],
-        year=user['year'],
-        mobile_number=user['mobile_number'],
-        role=user['role'],
-        verified=user['verified'],
-        created_at=datetime.fromisoformat(user['created_at'])
-    )
+    token = create_token({"sub": user['email'], "role": user['role']})
     
-    return TokenResponse(token=token, user=user_response)
+    return token_response(token, user)
 
 # Forgot Password - sends reset email
 @api_router.post("/auth/forgot-password")
@@ -357,60 +972,44 @@ async def forgot_password(request: ForgotPasswordRequest):
     if not user:
         return {"message": "If an account exists with this email, you will receive a password reset link."}
     
-    # Generate secure reset token
-    reset_token = secrets.token_urlsafe(32)
-    expires_at = datetime.now(timezone.utc) + timedelta(hours=1)
-    
-    # Store reset token in database
-    await db.password_resets.delete_many({"email": request.email})  # Remove old tokens
-    await db.password_resets.insert_one({
-        "email": request.email,
-        "token": reset_token,
-        "expires_at": expires_at.isoformat(),
-        "created_at": datetime.now(timezone.utc).isoformat()
-    })
+    if RESET_TOKEN_MODE == "signed":
+        # Stateless: nothing to store, validation is pure computation
+        reset_token = create_reset_token(user)
+    else:
+        # Generate secure reset token
+        reset_token = secrets.token_urlsafe(32)
+        expires_at = datetime.now(timezone.utc) + RESET_TOKEN_TTL
+        
+        # Store reset token in database
+        await db.password_resets.delete_many({"email": request.email})  # Remove old tokens
+        await db.password_resets.insert_one({
+            "email": request.email,
+            "token": reset_token,
+            "expires_at": expires_at,
+            "created_at": datetime.now(timezone.utc)
+        })
     
-    # Send email via Resend
+    # Hand off to the outbox worker; the request never waits on the email API
     reset_link = f"{FRONTEND_URL}/reset-password?token={reset_token}"
-    
-    if RESEND_API_KEY:
-        try:
-            resend.Emails.send({
-                "from": "UTSAH Fest <noreply@utsahfest.in>",
-                "to": [request.email],
-                "subject": "Reset Your UTSAH Password",
-                "html": f"""
-                <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto; padding: 20px;">
-                    <div style="background: linear-gradient(135deg, #d946ef 0%, #ec4899 100%); padding: 30px; border-radius: 10px 10px 0 0;">
-                        <h1 style="color: white; margin: 0; text-align: center;">UTSAH 2026</h1>
-                    </div>
-                    <div style="background: #1a1a2e; padding: 30px; border-radius: 0 0 10px 10px; color: #eee;">
-                        <h2 style="color: #d946ef;">Password Reset Request</h2>
-                        <p>Hi {user.get('full_name', 'there')},</p>
-                        <p>We received a request to reset your password. Click the button below to create a new password:</p>
-                        <div style="text-align: center; margin: 30px 0;">
-                            <a href="{reset_link}" style="background: linear-gradient(135deg, #d946ef 0%, #ec4899 100%); color: white; padding: 15px 30px; text-decoration: none; border-radius: 5px; font-weight: bold; display: inline-block;">Reset Password</a>
-                        </div>
-                        <p style="color: #888; font-size: 14px;">This link will expire in 1 hour.</p>
-                        <p style="color: #888; font-size: 14px;">If you didn't request this, you can safely ignore this email.</p>
-                        <hr style="border: 1px solid #333; margin: 20px 0;">
-                        <p style="color: #666; font-size: 12px; text-align: center;">UTSAH - Annual College Fest | GITA Autonomous College</p>
-                    </div>
-                </div>
-                """
-            })
-            logger.info(f"Password reset email sent to {request.email}")
-        except Exception as e:
-            logger.error(f"Failed to send reset email: {e}")
-            # Don't expose email errors to user
-    else:
-        logger.warning(f"RESEND_API_KEY not configured. Reset token for {request.email}: {reset_token}")
+    html_body = RESET_EMAIL_TEMPLATE.substitute(
+        full_name=html.escape(user.get('full_name', 'there')),
+        reset_link=html.escape(reset_link)
+    )
+    await enqueue_email(request.email, "Reset Your UTSAH Password", html_body)
+    logger.info(f"Password reset email queued for {request.email}")
     
     return {"message": "If an account exists with this email, you will receive a password reset link."}
 
 # Reset Password - validates token and updates password
 @api_router.post("/auth/reset-password")
 async def reset_password(request: ResetPasswordRequest):
+    # Validate password strength
+    if len(request.new_password) < 6:
+        raise HTTPException(status_code=400, detail="Password must be at least 6 characters long")
+    
+    if is_signed_reset_token(request.token):
+        return await reset_password_with_signed_token(request)
+    
     # Find the reset token
     reset_record = await db.password_resets.find_one({"token": request.token})
     
@@ -418,20 +1017,14 @@ async def reset_password(request: ResetPasswordRequest):
         raise HTTPException(status_code=400, detail="Invalid or expired reset token")
     
     # Check expiration
-    expires_at = datetime.fromisoformat(reset_record['expires_at'])
-    if expires_at.tzinfo is None:
-        expires_at = expires_at.replace(tzinfo=timezone.utc)
+    expires_at = as_datetime(reset_record['expires_at'])
     
-    if datetime.now(timezone.utc) > expires_at:
+    if expires_at is None or datetime.now(timezone.utc) > expires_at:
         await db.password_resets.delete_one({"token": request.token})
         raise HTTPException(status_code=400, detail="Reset token has expired. Please request a new one.")
     
-    # Validate password strength
-    if len(request.new_password) < 6:
-        raise HTTPException(status_code=400, detail="Password must be at least 6 characters long")
-    
     # Update user's password
-    hashed_password = hash_password(request.new_password)
+    hashed_password = await hash_password_async(request.new_password)
     result = await db.users.update_one(
         {"email": reset_record['email']},
         {"$set": {"password": hashed_password}}
@@ -439,6 +1032,7 @@ async def reset_password(request: ResetPasswordRequest):
     
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="User not found")
+    user_cache.invalidate(reset_record['email'])
     
     # Delete the used token
     await db.password_resets.delete_one({"token": request.token})
@@ -447,19 +1041,45 @@ async def reset_password(request: ResetPasswordRequest):
     
     return {"message": "Password reset successful. You can now login with your new password."}
 
+async def reset_password_with_signed_token(request: ResetPasswordRequest):
+    try:
+        claims = jwt.decode(request.token, options={"verify_signature": False})
+    except jwt.InvalidTokenError:
+        raise HTTPException(status_code=400, detail="Invalid or expired reset token")
+    
+    email = claims.get("sub")
+    if not email or claims.get("purpose") != "password_reset":
+        raise HTTPException(status_code=400, detail="Invalid or expired reset token")
+    
+    user = await db.users.find_one({"email": email}, {"_id": 0, "email": 1, "password": 1})
+    if not user:
+        raise HTTPException(status_code=400, detail="Invalid or expired reset token")
+    
+    try:
+        jwt.decode(request.token, reset_signing_key(user['password']), algorithms=[JWT_ALGORITHM])
+    except jwt.ExpiredSignatureError:
+        raise HTTPException(status_code=400, detail="Reset token has expired. Please request a new one.")
+    except jwt.InvalidTokenError:
+        # Also covers tokens already used: the password hash they were bound to is gone
+        raise HTTPException(status_code=400, detail="Invalid or expired reset token")
+    
+    hashed_password = await hash_password_async(request.new_password)
+    # Conditional on the old hash so two concurrent uses of one token can't both win
+    result = await db.users.update_one(
+        {"email": email, "password": user['password']},
+        {"$set": {"password": hashed_password}}
+    )
+    if result.modified_count == 0:
+        raise HTTPException(status_code=400, detail="Invalid or expired reset token")
+    user_cache.invalidate(email)
+    
+    logger.info(f"Password reset successful for {email}")
+    
+    return {"message": "Password reset successful. You can now login with your new password."}
+
 @api_router.get("/auth/me", response_model=UserResponse)
 async def get_me(user: dict = Depends(get_current_user)):
-    return UserResponse(
-        email=user['email'],
-        full_name=user['full_name'],
-        roll_number=user['roll_number'],
-        department=user['department'],
-        year=user['year'],
-        mobile_number=user['mobile_number'],
-        role=user['role'],
-        verified=user['verified'],
-        created_at=datetime.fromisoformat(user['created_at']) if isinstance(user['created_at'], str) else user['created_at']
-    )
+    return user_response(user)
 
 @api_router.put("/auth/me", response_model=UserResponse)
 async def update_me(updates: UserUpdate, user: dict = Depends(get_current_user)):
@@ -468,21 +1088,19 @@ async def update_me(updates: UserUpdate, user: dict = Depends(get_current_user))
     if not update_data:
          raise HTTPException(status_code=400, detail="No updates provided")
          
-    await db.users.update_one({"email": user['email']}, {"$set": update_data})
+    try:
+        await db.users.update_one({"email": user['email']}, {"$set": update_data})
+    except DuplicateKeyError:
+        # The unique roll_number index rejects a number another user holds
+        raise HTTPException(status_code=400, detail="Roll number already registered")
+    user_cache.invalidate(user['email'])
+    if any(user.get(field) != value for field, value in update_data.items() if field in EXPORT_USER_FIELDS):
+        await bump_snapshot_version()
     
     updated_user = await db.users.find_one({"email": user['email']}, {"_id": 0})
+    user_cache.set(user['email'], updated_user)
     
-    return UserResponse(
-        email=updated_user['email'],
-        full_name=updated_user['full_name'],
-        roll_number=updated_user['roll_number'],
-        department=updated_user['department'],
-        year=updated_user['year'],
-        mobile_number=updated_user['mobile_number'],
-        role=updated_user['role'],
-        verified=updated_user['verified'],
-        created_at=datetime.fromisoformat(updated_user['created_at']) if isinstance(updated_user['created_at'], str) else updated_user['created_at']
-    )
+    return user_response(updated_user)
 
 class EventUpdate(BaseModel):
     name: Optional[str] = None
@@ -500,6 +1118,247 @@ class EventUpdate(BaseModel):
     is_active: Optional[bool] = None
     is_registration_open: Optional[bool] = None
 
+# Public event catalog, kept in memory as pre-serialized JSON so browsing
+# never touches Mongo. Admin edits invalidate it; registered_count is
+# refreshed by a background task every EVENT_COUNT_REFRESH_SECONDS, and the
+# whole catalog is reloaded at least every EVENT_CATALOG_TTL seconds.
+EVENT_CATALOG_TTL = float(os.environ.get('EVENT_CATALOG_TTL', '300'))
+EVENT_COUNT_REFRESH_SECONDS = float(os.environ.get('EVENT_COUNT_REFRESH_SECONDS', '5'))
+
+class EventCatalog:
+    def __init__(self):
+        self.events: Optional[List[EventResponse]] = None
+        self.loaded_at = 0.0
+        self.version = 0
+        # Bumped by every invalidate(), so a load that overlaps an admin
+        # write can tell its snapshot is already stale
+        self.generation = 0
+        self._lists: Dict[Optional[str], tuple] = {}
+        self._items: Dict[str, tuple] = {}
+        self._lock = asyncio.Lock()
+
+    def invalidate(self):
+        self.events = None
+        self.generation += 1
+
+    def _reset_payloads(self):
+        self._lists = {}
+        self._items = {}
+        self.version += 1
+
+    async def _ensure_loaded(self) -> List[EventResponse]:
+        if self.events is not None and time.monotonic() - self.loaded_at < EVENT_CATALOG_TTL:
+            return self.events
+        async with self._lock:
+            if self.events is not None and time.monotonic() - self.loaded_at < EVENT_CATALOG_TTL:
+                return self.events
+            generation = self.generation
+            docs = await db.events.find({"is_active": True}, {"_id": 0}).to_list(None)
+            events = []
+            for event in docs:
+                try:
+                    events.append(EventResponse.model_validate(event))
+                except Exception as e:
+                    logger.error(f"Skipping corrupt event {event.get('id')}: {e}")
+            if generation != self.generation:
+                # Invalidated mid-load: serve this read but don't keep it
+                return events
+            self.events = events
+            self.loaded_at = time.monotonic()
+            self._reset_payloads()
+            return events
+
+    # Both return (payload, etag)
+    async def list_payload(self, sub_fest: Optional[str] = None) -> tuple:
+        events = await self._ensure_loaded()
+        cached = self._lists.get(sub_fest)
+        if cached is None:
+            selected = [e for e in events if not sub_fest or e.sub_fest == sub_fest]
+            payload = event_list_adapter.dump_json(selected)
+            cached = (payload, make_etag(payload))
+            # Filters that match nothing aren't kept, so arbitrary sub_fest
+            # values can't grow the catalog
+            if selected or not sub_fest:
+                self._lists[sub_fest] = cached
+        return cached
+
+    async def event_payload(self, event_id: str) -> Optional[tuple]:
+        events = await self._ensure_loaded()
+        cached = self._items.get(event_id)
+        if cached is None:
+            event = next((e for e in events if e.id == event_id), None)
+            if event is None:
+                return None
+            payload = event.model_dump_json().encode()
+            cached = self._items[event_id] = (payload, make_etag(payload))
+        return cached
+
+    async def refresh_counts(self, states: Optional[Dict[str, dict]] = None):
+        if self.events is None:
+            return
+        if states is None:
+            states = await load_event_states()
+        changed = False
+        for event in self.events:
+            state = states.get(event.id)
+            if state is None:
+                continue
+            for field in LIVE_EVENT_FIELDS:
+                if getattr(event, field) != state[field]:
+                    setattr(event, field, state[field])
+                    changed = True
+        if changed:
+            self._reset_payloads()
+
+event_catalog = EventCatalog()
+
+# The fields that change under a live catalog and are pushed to /api/stream
+LIVE_EVENT_FIELDS = ("registered_count", "is_registration_open")
+
+async def load_event_states() -> Dict[str, dict]:
+    return {
+        doc['id']: {"registered_count": doc.get('registered_count', 0), "is_registration_open": doc.get('is_registration_open', True)}
+        async for doc in db.events.find({"is_active": True}, {"_id": 0, "id": 1, **{field: 1 for field in LIVE_EVENT_FIELDS}})
+    }
+
+async def event_count_refresher():
+    # One poll feeds both the catalog and the live stream
+    while True:
+        await asyncio.sleep(EVENT_COUNT_REFRESH_SECONDS)
+        try:
+            states = await load_event_states()
+            await event_catalog.refresh_counts(states)
+            live_feed.publish_event_states(states)
+            await live_feed.publish_new_notifications()
+        except Exception as e:
+            logger.error(f"Event count refresh failed: {e}")
+
+# Server-Sent Events. One Broadcaster per worker serializes each message once
+# and fans it out to a bounded queue per connection, so an idle client costs
+# one parked coroutine. A client too slow to drain its queue is disconnected
+# and resumes with Last-Event-ID from a small replay buffer; ids carry a
+# per-worker prefix, and a client that lands on another worker is told to
+# refetch with a "reset" event instead.
+STREAM_MAX_CLIENTS = int(os.environ.get('STREAM_MAX_CLIENTS', '5000'))
+STREAM_QUEUE_SIZE = int(os.environ.get('STREAM_QUEUE_SIZE', '64'))
+STREAM_REPLAY_SIZE = int(os.environ.get('STREAM_REPLAY_SIZE', '256'))
+STREAM_HEARTBEAT_SECONDS = float(os.environ.get('STREAM_HEARTBEAT_SECONDS', '20'))
+
+class Broadcaster:
+    def __init__(self, queue_size: int, replay_size: int):
+        self.queue_size = queue_size
+        self.subscribers = set()
+        self.replay = deque(maxlen=replay_size)
+        self.prefix = secrets.token_hex(4)
+        self.sequence = 0
+        self.published = 0
+        self.dropped = 0
+
+    def subscribe(self, last_event_id: Optional[str] = None) -> asyncio.Queue:
+        queue = asyncio.Queue(self.queue_size)
+        if last_event_id:
+            prefix, _, sequence = last_event_id.partition("-")
+            seen = int(sequence) if sequence.isdigit() else -1
+            oldest = self.replay[0][0] if self.replay else self.sequence + 1
+            missed = [message for seq, message in self.replay if seq > seen]
+            # Can't replay another worker's ids, a gap or more than fits the queue
+            if prefix != self.prefix or seen < oldest - 1 or len(missed) >= self.queue_size:
+                missed = [self._format("reset", {})]
+            for message in missed:
+                queue.put_nowait(message)
+        self.subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self.subscribers.discard(queue)
+
+    def _format(self, event: str, data: dict) -> bytes:
+        return b"id: %s-%d\nevent: %s\ndata: %s\n\n" % (self.prefix.encode(), self.sequence, event.encode(), orjson.dumps(data))
+
+    def publish(self, event: str, data: dict):
+        self.sequence += 1
+        message = self._format(event, data)
+        self.replay.append((self.sequence, message))
+        self.published += 1
+        for queue in list(self.subscribers):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # Too far behind: empty the queue and leave only the
+                # end-of-stream marker, the client reconnects and replays
+                self.subscribers.discard(queue)
+                self.dropped += 1
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+
+    def stats(self) -> dict:
+        return {
+            "clients": len(self.subscribers),
+            "max_clients": STREAM_MAX_CLIENTS,
+            "published": self.published,
+            "dropped_slow_clients": self.dropped,
+        }
+
+broadcaster = Broadcaster(STREAM_QUEUE_SIZE, STREAM_REPLAY_SIZE)
+
+class LiveFeed:
+    # Turns polled database state into stream messages. The first poll only
+    # records a baseline, so clients get changes, not a replay of everything.
+    def __init__(self):
+        self.event_states: Optional[Dict[str, dict]] = None
+        self.notifications_after: Optional[datetime] = None
+
+    def publish_event_states(self, states: Dict[str, dict]):
+        previous, self.event_states = self.event_states, states
+        if previous is None:
+            return
+        for event_id, state in states.items():
+            before = previous.get(event_id)
+            changed = {field: value for field, value in state.items() if before is None or before[field] != value}
+            if changed:
+                broadcaster.publish("event", {"id": event_id, **changed})
+        for event_id in previous.keys() - states.keys():
+            broadcaster.publish("event", {"id": event_id, "is_active": False})
+
+    async def publish_new_notifications(self):
+        if self.notifications_after is None:
+            latest = await db.notifications.find_one({"created_at": {"$type": "date"}}, {"_id": 0, "created_at": 1}, sort=[("created_at", -1)])
+            self.notifications_after = as_datetime(latest["created_at"]) if latest else datetime.now(timezone.utc)
+            return
+        async for notification in db.notifications.find({"created_at": {"$gt": self.notifications_after}}, {"_id": 0}).sort("created_at", 1):
+            self.notifications_after = notification["created_at"]
+            broadcaster.publish("notification", notification)
+
+live_feed = LiveFeed()
+
+@api_router.get("/stream")
+async def event_stream(request: Request):
+    if len(broadcaster.subscribers) >= STREAM_MAX_CLIENTS:
+        raise HTTPException(status_code=503, detail="Too many live connections", headers={"Retry-After": "30"})
+    queue = broadcaster.subscribe(request.headers.get("last-event-id"))
+    
+    async def stream():
+        try:
+            yield b"retry: 5000\n\n"
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=STREAM_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    message = b": ping\n\n"
+                if message is None:
+                    break
+                yield message
+        finally:
+            broadcaster.unsubscribe(queue)
+    
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",
+        # Keep GZip from buffering the stream
+        "Content-Encoding": "identity",
+    })
+
 # Event endpoints
 @api_router.post("/events", response_model=EventResponse)
 async def create_event(event: EventCreate, admin: dict = Depends(get_admin_user)):
@@ -507,18 +1366,23 @@ async def create_event(event: EventCreate, admin: dict = Depends(get_admin_user)
     event_dict['id'] = f"{event.sub_fest}-{event.name}".replace(" ", "-").lower()
     event_dict['registered_count'] = 0
     event_dict['is_active'] = True
-    event_dict['created_at'] = datetime.now(timezone.utc).isoformat()
-    event_dict['registration_deadline'] = event.registration_deadline.isoformat()
+    event_dict['created_at'] = datetime.now(timezone.utc)
     event_dict['rulebooks'] = []
     
-    # Check for duplicates
-    existing = await db.events.find_one({"id": event_dict['id']})
-    if existing:
-        raise HTTPException(status_code=400, detail="Event with this name already exists in this sub-fest")
+    # Check for duplicates (the unique index on events.id does this on insert)
+    if not unique_index_ready("events", [("id", 1)]):
+        existing = await db.events.find_one({"id": event_dict['id']}, {"_id": 1})
+        if existing:
+            raise HTTPException(status_code=400, detail="Event with this name already exists in this sub-fest")
          
-    await db.events.insert_one(event_dict)
+    try:
+        await db.events.insert_one(event_dict)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Event with this name already exists in this sub-fest")
+    
+    event_catalog.invalidate()
     
-    return EventResponse(**{**event_dict, 'registration_deadline': event.registration_deadline, 'created_at': datetime.fromisoformat(event_dict['created_at'])})
+    return EventResponse(**event_dict)
 
 from fastapi.staticfiles import StaticFiles
 
@@ -534,6 +1398,7 @@ PDF_DIR.mkdir(parents=True, exist_ok=True)
 app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
 
 from bson.binary import Binary
+from bson import ObjectId
 import base64
 
 # ... (imports)
@@ -541,72 +1406,440 @@ import base64
 # We are switching to Database storage for files to ensure persistence across deployments
 # No more static file mounting needed
 
+# Blobs live in a GridFS bucket (blobs.files / blobs.chunks) with the public
+# file id as their _id; db.files keeps the metadata. Documents from before
+# the switch still carry their bytes in a `content` field and are served as is.
+#
+# Files are content-addressed: the id is "sha256-<digest>", so re-uploading
+# the same PDF reuses the stored blob and bumps db.files.refcount. Because the
+# bytes behind an id can never change, downloads are cached as immutable.
+FILE_CHUNK_SIZE = 255 * 1024
+FILE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+RULEBOOK_MAX_BYTES = int(os.environ.get('RULEBOOK_MAX_BYTES', str(10 * 1024 * 1024)))
+file_bucket = AsyncIOMotorGridFSBucket(db, bucket_name="blobs", chunk_size_bytes=FILE_CHUNK_SIZE)
+
+def parse_range(header: Optional[str], length: int) -> Optional[tuple]:
+    # Single byte ranges only; anything else is answered with the full body
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    start_s, _, end_s = header[len("bytes="):].strip().partition("-")
+    try:
+        if start_s == "":
+            suffix = int(end_s)
+            start, end = (max(length - suffix, 0), length - 1) if suffix > 0 else (length, length - 1)
+        else:
+            start = int(start_s)
+            end = min(int(end_s), length - 1) if end_s else length - 1
+    except ValueError:
+        return None
+    if start >= length or start > end:
+        raise HTTPException(
+            status_code=416,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{length}"}
+        )
+    return start, end
+
+# Local disk cache in front of GridFS. Mongo stays the source of truth; hot
+# blobs are kept under FILE_CACHE_DIR (LRU, bounded by FILE_CACHE_MAX_BYTES)
+# and served with FileResponse. A redeploy just starts with a cold cache.
+FILE_CACHE_DIR = Path(os.environ.get('FILE_CACHE_DIR', str(ROOT_DIR / 'file_cache')))
+FILE_CACHE_MAX_BYTES = int(os.environ.get('FILE_CACHE_MAX_BYTES', str(256 * 1024 * 1024)))
+SAFE_FILE_ID = re.compile(r'^[A-Za-z0-9_-]+$')
+
+class DiskBlobCache:
+    def __init__(self, directory: Path, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.entries: "OrderedDict[str, int]" = OrderedDict()
+        self.total = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.filling = set()
+        if max_bytes > 0:
+            self._load()
+
+    def _load(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for tmp in self.directory.glob("*.tmp"):
+            tmp.unlink(missing_ok=True)
+        blobs = [(path, path.stat()) for path in self.directory.glob("*.blob")]
+        for path, stat in sorted(blobs, key=lambda item: item[1].st_atime):
+            self.entries[path.stem] = stat.st_size
+            self.total += stat.st_size
+        self._evict()
+
+    def path(self, file_id: str) -> Path:
+        return self.directory / f"{file_id}.blob"
+
+    def temp_path(self, file_id: str) -> Path:
+        return self.directory / f"{file_id}.{secrets.token_hex(4)}.tmp"
+
+    def cacheable(self, file_id: str, length: int) -> bool:
+        return self.max_bytes > 0 and length <= self.max_bytes // 4 and bool(SAFE_FILE_ID.match(file_id))
+
+    def get(self, file_id: str) -> Optional[Path]:
+        if file_id in self.entries:
+            path = self.path(file_id)
+            if path.exists():
+                self.entries.move_to_end(file_id)
+                self.hits += 1
+                return path
+            # Evicted by another worker sharing the directory
+            self.total -= self.entries.pop(file_id)
+        self.misses += 1
+        return None
+
+    def commit(self, file_id: str, tmp: Path):
+        size = tmp.stat().st_size
+        os.replace(tmp, self.path(file_id))
+        if file_id in self.entries:
+            self.total -= self.entries.pop(file_id)
+        self.entries[file_id] = size
+        self.total += size
+        self._evict()
+
+    def discard(self, file_id: str):
+        if file_id in self.entries:
+            self.total -= self.entries.pop(file_id)
+        self.path(file_id).unlink(missing_ok=True)
+
+    def _evict(self):
+        while self.total > self.max_bytes and self.entries:
+            file_id, size = self.entries.popitem(last=False)
+            self.total -= size
+            self.evictions += 1
+            self.path(file_id).unlink(missing_ok=True)
+
+    def stats(self) -> dict:
+        return {
+            "directory": str(self.directory),
+            "files": len(self.entries),
+            "bytes": self.total,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+disk_cache = DiskBlobCache(FILE_CACHE_DIR, FILE_CACHE_MAX_BYTES)
+
+# Uploads are parsed straight off the request stream instead of going through
+# UploadFile, so an oversize body is refused at the first byte past the limit
+# and no more than one network chunk of it is ever held in memory.
+SHORTLIST_MAX_BYTES = int(os.environ.get('SHORTLIST_MAX_BYTES', str(5 * 1024 * 1024)))
+MULTIPART_OVERHEAD = 64 * 1024  # boundaries, part headers and small form fields
+
+class UploadTooLarge(Exception):
+    pass
+
+def too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(status_code=413, detail=f"File too large (max {max_bytes // (1024 * 1024)}MB)")
+
+async def stream_multipart(request: Request, file_field: str, suffixes: tuple, max_bytes: int, write_chunk) -> dict:
+    # Feeds the file part to write_chunk as it arrives and returns the text
+    # fields. Parser callbacks are synchronous, so they only queue events that
+    # are drained (and awaited) after each network chunk.
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or b"boundary" not in params:
+        raise HTTPException(status_code=400, detail="Expected a multipart/form-data upload")
+    declared = request.headers.get("content-length", "")
+    if declared.isdigit() and int(declared) > max_bytes + MULTIPART_OVERHEAD:
+        raise too_large(max_bytes)
+    
+    events = []
+    header = {"field": b"", "value": b"", "headers": {}}
+    def on_header_field(data, start, end):
+        header["field"] += data[start:end]
+    def on_header_value(data, start, end):
+        header["value"] += data[start:end]
+    def on_header_end():
+        header["headers"][header["field"].lower()] = header["value"]
+        header["field"] = header["value"] = b""
+    def on_headers_finished():
+        events.append(("headers", header["headers"]))
+        header["headers"] = {}
+    
+    parser = MultipartParser(params[b"boundary"], {
+        "on_header_field": on_header_field,
+        "on_header_value": on_header_value,
+        "on_header_end": on_header_end,
+        "on_headers_finished": on_headers_finished,
+        "on_part_data": lambda data, start, end: events.append(("data", data[start:end])),
+        "on_part_end": lambda: events.append(("end", None)),
+    })
+    
+    fields = {}
+    part = None
+    received = 0
+    found = False
+    async for chunk in request.stream():
+        parser.write(chunk)
+        for kind, value in events:
+            if kind == "headers":
+                _, options = parse_options_header(value.get(b"content-disposition", b""))
+                name = options.get(b"name", b"").decode()
+                is_file = b"filename" in options
+                if is_file and name == file_field:
+                    filename = options[b"filename"].decode()
+                    if not filename.lower().endswith(suffixes):
+                        raise HTTPException(status_code=400, detail=f"Only {', '.join(suffixes)} files allowed")
+                    fields["filename"] = filename
+                    found = True
+                part = {"name": name, "is_file": is_file, "buffer": bytearray()}
+            elif kind == "data" and part is not None:
+                if not part["is_file"]:
+                    part["buffer"] += value
+                    if len(part["buffer"]) > MULTIPART_OVERHEAD:
+                        raise HTTPException(status_code=400, detail=f"Form field '{part['name']}' too large")
+                elif part["name"] == file_field:
+                    received += len(value)
+                    if received > max_bytes:
+                        raise UploadTooLarge()
+                    await write_chunk(value)
+            elif kind == "end" and part is not None:
+                if not part["is_file"]:
+                    fields[part["name"]] = part["buffer"].decode()
+                part = None
+        events.clear()
+    parser.finalize()
+    
+    if not found:
+        raise HTTPException(status_code=400, detail=f"Missing '{file_field}' upload")
+    return fields
+
+class BlobWriter:
+    # The content address is only known once the last byte is in, so chunks
+    # go to GridFS under a provisional blob id; db.files maps the sha256 id to
+    # it. A duplicate upload drops its provisional blob and takes a reference.
+    def __init__(self, content_type: str):
+        self.content_type = content_type
+        self.blob_id = f"upload-{secrets.token_hex(8)}"
+        self.digest = hashlib.sha256()
+        self.length = 0
+        self.grid_in = file_bucket.open_upload_stream_with_id(self.blob_id, self.blob_id, metadata={"content_type": content_type})
+    
+    async def write(self, chunk: bytes):
+        self.digest.update(chunk)
+        self.length += len(chunk)
+        await self.grid_in.write(chunk)
+    
+    async def abort(self):
+        try:
+            await self.grid_in.abort()
+        except Exception as e:
+            logger.warning(f"Could not clean up partial upload {self.blob_id}: {e}")
+    
+    async def commit(self, filename: str) -> str:
+        await self.grid_in.close()
+        sha256 = self.digest.hexdigest()
+        file_id = f"sha256-{sha256}"
+        
+        # Already stored: just take another reference
+        existing = await db.files.find_one_and_update({"id": file_id}, {"$inc": {"refcount": 1}}, projection={"_id": 1})
+        if not existing:
+            try:
+                await db.files.insert_one({
+                    "id": file_id,
+                    "filename": filename,
+                    "storage": "gridfs",
+                    "blob_id": self.blob_id,
+                    "sha256": sha256,
+                    "length": self.length,
+                    "content_type": self.content_type,
+                    "refcount": 1,
+                    "uploaded_at": datetime.now(timezone.utc)
+                })
+                return file_id
+            except DuplicateKeyError:
+                # Same bytes uploaded concurrently; that blob is identical
+                await db.files.update_one({"id": file_id}, {"$inc": {"refcount": 1}})
+        await file_bucket.delete(self.blob_id)
+        return file_id
+
+async def release_blob(file_id: str):
+    file_doc = await db.files.find_one_and_update(
+        {"id": file_id},
+        {"$inc": {"refcount": -1}},
+        projection={"_id": 0, "storage": 1, "blob_id": 1, "refcount": 1},
+        return_document=ReturnDocument.AFTER
+    )
+    # Legacy documents have no refcount and belong to a single rulebook
+    if not file_doc or file_doc.get("refcount", 0) > 0:
+        return
+    result = await db.files.delete_one({"id": file_id, "refcount": {"$lte": 0}})
+    if result.deleted_count != 1:
+        # The same bytes were uploaded again in between and took a reference
+        return
+    disk_cache.discard(file_id)
+    if file_doc.get("storage") == "gridfs":
+        try:
+            await file_bucket.delete(file_doc.get("blob_id", file_id))
+        except NoFile:
+            pass
+
+async def stream_blob(blob_id: str, start: int, end: int):
+    grid_out = await file_bucket.open_download_stream(blob_id)
+    grid_out.seek(start)
+    remaining = end - start + 1
+    # Align reads to chunk boundaries so at most one chunk is held in memory
+    size = FILE_CHUNK_SIZE - (start % FILE_CHUNK_SIZE)
+    while remaining > 0:
+        data = await grid_out.read(min(size, remaining))
+        if not data:
+            break
+        remaining -= len(data)
+        size = FILE_CHUNK_SIZE
+        yield data
+
+async def stream_blob_into_cache(file_id: str, blob_id: str, length: int):
+    # Tee a full download into the disk cache; only a complete copy is kept
+    tmp = disk_cache.temp_path(file_id)
+    complete = False
+    disk_cache.filling.add(file_id)
+    try:
+        with open(tmp, "wb") as f:
+            async for data in stream_blob(blob_id, 0, length - 1):
+                await asyncio.to_thread(f.write, data)
+                yield data
+            complete = f.tell() == length
+        if complete:
+            disk_cache.commit(file_id, tmp)
+    finally:
+        disk_cache.filling.discard(file_id)
+        if not complete:
+            tmp.unlink(missing_ok=True)
+
+async def fill_disk_cache(file_id: str, blob_id: str, length: int):
+    try:
+        async for _ in stream_blob_into_cache(file_id, blob_id, length):
+            pass
+    except Exception as e:
+        logger.warning(f"Could not cache {file_id} on disk: {e}")
+
+async def stream_cached_range(path: Path, start: int, end: int):
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            data = await asyncio.to_thread(f.read, min(FILE_CHUNK_SIZE, remaining))
+            if not data:
+                break
+            remaining -= len(data)
+            yield data
+
+def download_name(name: str) -> str:
+    # Safe to place unquoted in Content-Disposition
+    return re.sub(r"[^A-Za-z0-9._-]", "_", name)
+
 @api_router.get("/files/{file_id}")
-async def get_file(file_id: str):
-    file_doc = await db.files.find_one({"id": file_id})
+async def get_file(file_id: str, request: Request, filename: Optional[str] = None):
+    file_doc = await db.files.find_one({"id": file_id}, {"_id": 0, "content": 0})
     if not file_doc:
         raise HTTPException(status_code=404, detail="File not found")
-        
-    return Response(
-        content=file_doc['content'],
-        media_type="application/pdf",
-        headers={"Content-Disposition": f"inline; filename={file_doc['filename']}"}
-    )
+    
+    # Content under an id never changes, so any cached copy is still valid
+    etag = f'"{file_doc.get("sha256", file_id)}"'
+    cache_headers = {"ETag": etag, "Cache-Control": FILE_CACHE_CONTROL}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=cache_headers)
+    
+    content = None
+    if file_doc.get("storage") == "gridfs":
+        length = file_doc["length"]
+        # Streamed uploads are stored under a provisional blob id
+        blob_id = file_doc.get("blob_id", file_id)
+    else:
+        legacy = await db.files.find_one({"id": file_id}, {"_id": 0, "content": 1})
+        content = legacy['content']
+        length = len(content)
+    
+    byte_range = parse_range(request.headers.get("range"), length)
+    start, end = byte_range or (0, length - 1)
+    headers = {
+        # Content-addressed files are shared, so each reference carries its own name
+        "Content-Disposition": f"inline; filename={download_name(filename or file_doc['filename'])}",
+        "Accept-Ranges": "bytes",
+        "Content-Length": str(end - start + 1),
+        # PDFs barely compress, and gzip would break byte ranges
+        "Content-Encoding": "identity",
+        **cache_headers,
+    }
+    if byte_range:
+        headers["Content-Range"] = f"bytes {start}-{end}/{length}"
+    status_code = 206 if byte_range else 200
+    media_type = file_doc.get("content_type", "application/pdf")
+    
+    if content is not None:
+        return Response(content=content[start:end + 1], status_code=status_code, media_type=media_type, headers=headers)
+    
+    if disk_cache.cacheable(file_id, length):
+        path = disk_cache.get(file_id)
+        if path is not None:
+            if byte_range:
+                return StreamingResponse(stream_cached_range(path, start, end), status_code=status_code, media_type=media_type, headers=headers)
+            # Served with sendfile where the server supports it
+            return FileResponse(path, media_type=media_type, headers=headers)
+        if file_id not in disk_cache.filling:
+            if not byte_range:
+                return StreamingResponse(stream_blob_into_cache(file_id, blob_id, length), media_type=media_type, headers=headers)
+            schedule_background(fill_disk_cache(file_id, blob_id, length))
+    
+    return StreamingResponse(stream_blob(blob_id, start, end), status_code=status_code, media_type=media_type, headers=headers)
 
 @api_router.post("/events/{event_id}/rulebooks")
 async def upload_rulebook(
     event_id: str, 
-    file: UploadFile = File(...), 
-    title: str = Form(...),
+    request: Request,
     admin: dict = Depends(get_admin_user)
 ):
-    if not file.filename.endswith('.pdf'):
-        raise HTTPException(status_code=400, detail="Only PDF files allowed")
-    
     # Check event exists
     event = await db.events.find_one({"id": event_id})
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
-        
+    
+    # Chunked GridFS storage, so files aren't bound by the 16MB document limit
+    writer = BlobWriter("application/pdf")
     try:
-        content = await file.read()
-        
-        # Limit file size to 10MB to be safe for Mongo document limit (16MB)
-        if len(content) > 10 * 1024 * 1024:
-             raise HTTPException(status_code=400, detail="File too large (max 10MB)")
-
-        file_id = f"file-{secrets.token_hex(8)}"
-        
-        # Store file content in valid BSON Binary format
-        # MongoDB handles bytes objects as Binary automatically
-        await db.files.insert_one({
-            "id": file_id,
-            "filename": f"{title.replace(' ', '_')}.pdf",
-            "content": content,  # direct bytes
-            "uploaded_at": datetime.now(timezone.utc).isoformat()
-        })
-            
-        # The URL now points to our API endpoint
-        url = f"{os.getenv('BACKEND_URL', 'http://localhost:8000')}/api/files/{file_id}"
-        
-        rulebook = {
-            "title": title,
-            "url": url,
-            "file_id": file_id, # Keep track for deletion
-            "uploaded_at": datetime.now(timezone.utc).isoformat()
-        }
-        
-        await db.events.update_one(
-            {"id": event_id},
-            {"$push": {"rulebooks": rulebook}}
-        )
-        
-        return rulebook
-    except HTTPException as he:
-        raise he
+        fields = await stream_multipart(request, "file", (".pdf",), RULEBOOK_MAX_BYTES, writer.write)
+        title = fields.get("title", "").strip()
+        if not title:
+            raise HTTPException(status_code=400, detail="Rulebook title is required")
+        filename = download_name(f"{title.replace(' ', '_')}.pdf")
+        file_id = await writer.commit(filename)
+    except UploadTooLarge:
+        await writer.abort()
+        raise too_large(RULEBOOK_MAX_BYTES)
+    except HTTPException:
+        await writer.abort()
+        raise
     except Exception as e:
+        await writer.abort()
         logger.error(f"Failed to upload rulebook: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to save file to database: {str(e)}")
+    
+    # The URL now points to our API endpoint
+    url = f"{os.getenv('BACKEND_URL', 'http://localhost:8000')}/api/files/{file_id}?filename={quote(filename)}"
+    
+    rulebook = {
+        "title": title,
+        "url": url,
+        "file_id": file_id, # Keep track for deletion
+        "uploaded_at": datetime.now(timezone.utc).isoformat()
+    }
+    
+    result = await db.events.update_one(
+        {"id": event_id},
+        {"$push": {"rulebooks": rulebook}}
+    )
+    if result.matched_count == 0:
+        # Event deleted while the upload was streaming
+        await release_blob(file_id)
+        raise HTTPException(status_code=404, detail="Event not found")
+    event_catalog.invalidate()
+    
+    return rulebook
 
 @api_router.delete("/events/{event_id}/rulebooks")
 async def delete_rulebook(
@@ -632,48 +1865,22 @@ async def delete_rulebook(
         
     # Clean up file from DB if possible
     if rulebook and 'file_id' in rulebook:
-        await db.files.delete_one({"id": rulebook['file_id']})
+        await release_blob(rulebook['file_id'])
+    event_catalog.invalidate()
     
     return {"message": "Rulebook deleted"}
     
 @api_router.get("/events", response_model=List[EventResponse])
-async def get_events(sub_fest: Optional[str] = None):
-    query = {"is_active": True}
-    if sub_fest:
-        query['sub_fest'] = sub_fest
-    
-    events = await db.events.find(query, {"_id": 0}).to_list(1000)
-    
-    processed_events = []
-    for event in events:
-        try:
-            if isinstance(event.get('registration_deadline'), str):
-                event['registration_deadline'] = datetime.fromisoformat(event['registration_deadline'])
-            if isinstance(event.get('created_at'), str):
-                event['created_at'] = datetime.fromisoformat(event['created_at'])
-            if 'rulebooks' not in event:
-                event['rulebooks'] = []
-            processed_events.append(EventResponse(**event))
-        except Exception as e:
-            logger.error(f"Skipping corrupt event {event.get('id')}: {e}")
-            continue
-    
-    return processed_events
+async def get_events(request: Request, sub_fest: Optional[str] = None):
+    payload, etag = await event_catalog.list_payload(sub_fest)
+    return conditional_json(request, payload, etag)
 
 @api_router.get("/events/{event_id}", response_model=EventResponse)
-async def get_event(event_id: str):
-    event = await db.events.find_one({"id": event_id, "is_active": True}, {"_id": 0})
-    if not event:
+async def get_event(event_id: str, request: Request):
+    cached = await event_catalog.event_payload(event_id)
+    if cached is None:
         raise HTTPException(status_code=404, detail="Event not found")
-    
-    if isinstance(event['registration_deadline'], str):
-        event['registration_deadline'] = datetime.fromisoformat(event['registration_deadline'])
-    if isinstance(event['created_at'], str):
-        event['created_at'] = datetime.fromisoformat(event['created_at'])
-    if 'rulebooks' not in event:
-        event['rulebooks'] = []
-    
-    return EventResponse(**event)
+    return conditional_json(request, *cached)
 
 
 @api_router.put("/events/{event_id}", response_model=EventResponse)
@@ -686,80 +1893,354 @@ async def update_event(event_id: str, updates: EventUpdate, admin: dict = Depend
     if not update_data:
          raise HTTPException(status_code=400, detail="No updates provided")
 
-    if 'registration_deadline' in update_data:
-        update_data['registration_deadline'] = update_data['registration_deadline'].isoformat()
-        
     result = await db.events.update_one({"id": event_id}, {"$set": update_data})
     
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Event not found")
         
-    updated = await db.events.find_one({"id": event_id}, {"_id": 0})
+    if "capacity" in update_data and SEAT_COUNTER_SHARDS > 1:
+        await rebalance_counter_slots(event_id, update_data["capacity"])
     
-    try:
-        if isinstance(updated.get('registration_deadline'), str):
-            updated['registration_deadline'] = datetime.fromisoformat(updated['registration_deadline'])
-        if isinstance(updated.get('created_at'), str):
-            updated['created_at'] = datetime.fromisoformat(updated['created_at'])
-        if 'rulebooks' not in updated:
-            updated['rulebooks'] = []
-    except Exception as e:
-         logger.error(f"Error parsing date for updated event {event_id}: {e}")
+    updated = await db.events.find_one({"id": event_id}, {"_id": 0})
+    event_catalog.invalidate()
+    if SNAPSHOT_EVENT_FIELDS & update_data.keys():
+        await bump_snapshot_version()
     
     return EventResponse(**updated)
 
 @api_router.delete("/events/{event_id}")
 async def delete_event(event_id: str, admin: dict = Depends(get_admin_user)):
+    event = await db.events.find_one({"id": event_id}, {"_id": 0, "sub_fest": 1, "rulebooks": 1})
+    
     # Delete the event (use delete_many in case of duplicates)
     result = await db.events.delete_many({"id": event_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Event not found")
     
-    # Also delete associated registrations to maintain clean state
+    # Give the registrants their sub-fest quota back, then delete the registrations
+    emails = await db.registrations.distinct("student_email", {"event_id": event_id})
+    if emails and event and event.get("sub_fest"):
+        await db.registration_quotas.update_many(
+            {"student_email": {"$in": emails}, "sub_fest": event["sub_fest"], "count": {"$gt": 0}},
+            {"$inc": {"count": -1}}
+        )
     await db.registrations.delete_many({"event_id": event_id})
+    await db.event_counters.delete_many({"event_id": event_id})
+    for rulebook in (event or {}).get("rulebooks", []):
+        if rulebook.get("file_id"):
+            await release_blob(rulebook["file_id"])
+    event_catalog.invalidate()
+    await bump_snapshot_version()
     
     return {"message": "Event and associated registrations deleted successfully"}
 
-# Registration endpoints
-@api_router.post("/registrations", response_model=RegistrationResponse)
-async def register_for_event(registration: EventRegistration, user: dict = Depends(get_current_user)):
-    # Get event
-    event = await db.events.find_one({"id": registration.event_id, "is_active": True}, {"_id": 0})
+# Per-sub-fest participation limits. Defaults can be overridden with the
+# SUB_FEST_LIMITS env var (JSON) or a {"type": "sub_fest_limits"} document in
+# db.system; the effective map is cached for SUB_FEST_LIMITS_TTL seconds.
+DEFAULT_SUB_FEST_LIMIT = 2
+SUB_FEST_LIMITS = {
+    "TECHNOLOGY-ANWESH": 2,
+    "CULTURAL-AKANKSHA": 2,
+    "SPORTS-AHWAAN": 4,
+    **json.loads(os.environ.get('SUB_FEST_LIMITS', '{}'))
+}
+SUB_FEST_LIMITS_TTL = float(os.environ.get('SUB_FEST_LIMITS_TTL', '60'))
+sub_fest_limits_cache = {"limits": None, "expires": 0.0}
+
+async def get_sub_fest_limits() -> Dict[str, int]:
+    if sub_fest_limits_cache["limits"] is None or sub_fest_limits_cache["expires"] < time.monotonic():
+        doc = await db.system.find_one({"type": "sub_fest_limits"}, {"_id": 0, "limits": 1})
+        sub_fest_limits_cache["limits"] = {**SUB_FEST_LIMITS, **((doc or {}).get("limits") or {})}
+        sub_fest_limits_cache["expires"] = time.monotonic() + SUB_FEST_LIMITS_TTL
+    return sub_fest_limits_cache["limits"]
+
+# Seat admission: an event has room while registered_count < capacity
+# (events without a capacity fall back to the EventResponse default of 100).
+SEAT_AVAILABLE_EXPR = {"$lt": [{"$ifNull": ["$registered_count", 0]}, {"$ifNull": ["$capacity", 100]}]}
+
+# Optionally, with SEAT_COUNTER_SHARDS > 1, the seats live in db.event_counters:
+# N slot documents per event, each holding a share of the capacity as
+# count/free. Admissions land on a random slot and the sum of `free` can
+# never exceed the capacity. Slots are seeded from the registrations
+# collection on first use and capacity edits rebalance them.
+#
+# Slots belong to a generation, events.counter_gen. A resync bumps it
+# instead of deleting slots under running admissions: seats handed back
+# from an older generation are dropped rather than inflating `free`, and an
+# admission re-reads the event after inserting its registration
+# (recheck_seat), taking a seat in the new generation or backing out. That
+# re-read is also what makes closing registration take effect atomically.
+#
+# Sharding always comes with events.registered_count written behind;
+# otherwise every admission would still $inc the events document and the
+# slots would only add round trips. Changed events are collected in process
+# and, every COUNTER_FLUSH_SECONDS, set to the total of their current
+# slots. Being a $set from the slots rather than a sum of buffered deltas,
+# a flush landing after a resync cannot count anything twice. A worker
+# crash can still leave a total stale until the event's next admission, so
+# the reconciler below is switched on with it. Off by default.
+SEAT_COUNTER_SHARDS = int(os.environ.get('SEAT_COUNTER_SHARDS', '1'))
+COUNTER_FLUSH_SECONDS = float(os.environ.get('COUNTER_FLUSH_SECONDS', '1'))
+if SEAT_COUNTER_SHARDS > 1 and COUNTER_FLUSH_SECONDS <= 0:
+    logger.warning("SEAT_COUNTER_SHARDS needs COUNTER_FLUSH_SECONDS > 0 to write registered_count behind; using the events document for seats")
+    SEAT_COUNTER_SHARDS = 1
+COUNT_WRITE_BEHIND = SEAT_COUNTER_SHARDS > 1
+pending_count_events: set = set()
+counter_flush_stats = {"flushes": 0, "flushed_events": 0, "failures": 0, "rebalances": 0, "resyncs": 0, "rechecked_seats": 0}
+
+def share(total: int, slot: int, slots: int) -> int:
+    return total // slots + (1 if slot < total % slots else 0)
+
+def older_generations(gen: int) -> dict:
+    # Also matches slots written before generations existed
+    return {"$not": {"$gte": gen}}
+
+async def seed_counter_slots(event: dict):
+    gen = event.get("counter_gen", 0)
+    taken = await db.registrations.count_documents({"event_id": event["id"]})
+    capacity = event.get("capacity")
+    free = max((100 if capacity is None else capacity) - taken, 0)
+    slots = [
+        {"event_id": event["id"], "gen": gen, "slot": slot, "count": share(taken, slot, SEAT_COUNTER_SHARDS), "free": share(free, slot, SEAT_COUNTER_SHARDS)}
+        for slot in range(SEAT_COUNTER_SHARDS)
+    ]
+    try:
+        await db.event_counters.insert_many(slots, ordered=False)
+    except BulkWriteError:
+        pass  # Seeded concurrently by another request
+    await db.event_counters.delete_many({"event_id": event["id"], "gen": older_generations(gen)})
+
+async def take_counter_slot(event: dict) -> bool:
+    key = {"event_id": event["id"], "gen": event.get("counter_gen", 0)}
+    take = {"$inc": {"count": 1, "free": -1}}
+    slot = secrets.randbelow(SEAT_COUNTER_SHARDS)
+    result = await db.event_counters.update_one({**key, "slot": slot, "free": {"$gt": 0}}, take)
+    if result.modified_count:
+        return True
+    # That slot is used up; any slot with room will do
+    result = await db.event_counters.update_one({**key, "free": {"$gt": 0}}, take)
+    if result.modified_count:
+        return True
+    if await db.event_counters.count_documents(key, limit=1):
+        return False
+    await seed_counter_slots(event)
+    result = await db.event_counters.update_one({**key, "free": {"$gt": 0}}, take)
+    return bool(result.modified_count)
+
+async def return_counter_slot(event_id: str, gen: int):
+    # A seat from a generation that has since been reset is simply dropped:
+    # the reseed counted registrations, not reservations
+    give_back = {"$inc": {"count": -1, "free": 1}}
+    key = {"event_id": event_id, "gen": gen}
+    slot = secrets.randbelow(SEAT_COUNTER_SHARDS)
+    result = await db.event_counters.update_one({**key, "slot": slot, "count": {"$gt": 0}}, give_back)
+    if not result.modified_count:
+        await db.event_counters.update_one({**key, "count": {"$gt": 0}}, give_back)
+
+async def current_counter_gen(event_id: str) -> int:
+    event = await db.events.find_one({"id": event_id}, {"_id": 0, "counter_gen": 1})
+    return (event or {}).get("counter_gen", 0)
+
+async def reset_counter_slots(query: dict):
+    # Start a new generation for the matching events; their slots reseed
+    # from registrations on next use
+    await db.events.update_many(query, {"$inc": {"counter_gen": 1}})
+    ops = [
+        DeleteMany({"event_id": event["id"], "gen": older_generations(event.get("counter_gen", 0))})
+        async for event in db.events.find(query, {"_id": 0, "id": 1, "counter_gen": 1})
+    ]
+    if ops:
+        await db.event_counters.bulk_write(ops, ordered=False)
+    counter_flush_stats["resyncs"] += 1
+
+async def rebalance_counter_slots(event_id: str, capacity: int):
+    # Spread the new free capacity over the slots. Each write is conditional
+    # on the slot being unchanged since we read it; on contention, re-read.
+    for _ in range(5):
+        key = {"event_id": event_id, "gen": await current_counter_gen(event_id)}
+        slots = await db.event_counters.find(key, {"_id": 0, "slot": 1, "count": 1, "free": 1}).sort("slot", 1).to_list(None)
+        if not slots:
+            return  # Seeded with the new capacity on next use
+        free = max(capacity - sum(slot["count"] for slot in slots), 0)
+        ops = [
+            UpdateOne(
+                {**key, "slot": slot["slot"], "count": slot["count"], "free": slot["free"]},
+                {"$set": {"free": share(free, i, len(slots))}}
+            )
+            for i, slot in enumerate(slots)
+        ]
+        result = await db.event_counters.bulk_write(ops, ordered=False)
+        counter_flush_stats["rebalances"] += 1
+        if result.matched_count == len(ops):
+            return
+    logger.warning(f"Could not rebalance seat counters for {event_id}; they will be reseeded")
+    await reset_counter_slots({"id": event_id})
+
+async def slot_totals(gens: Dict[str, int]) -> Dict[str, int]:
+    # Seats taken per event in its current generation; events without
+    # current slots are left out
+    pipeline = [
+        {"$match": {"event_id": {"$in": list(gens)}}},
+        {"$group": {"_id": {"event_id": "$event_id", "gen": "$gen"}, "count": {"$sum": "$count"}}},
+    ]
+    return {
+        doc["_id"]["event_id"]: doc["count"]
+        async for doc in db.event_counters.aggregate(pipeline)
+        if doc["_id"].get("gen") == gens[doc["_id"]["event_id"]]
+    }
+
+def mark_count_changed(event_id: str):
+    pending_count_events.add(event_id)
+
+async def flush_count_deltas():
+    global pending_count_events
+    batch, pending_count_events = pending_count_events, set()
+    if not batch:
+        return
+    try:
+        gens = {
+            event["id"]: event.get("counter_gen", 0)
+            async for event in db.events.find({"id": {"$in": list(batch)}}, {"_id": 0, "id": 1, "counter_gen": 1})
+        }
+        totals = await slot_totals(gens)
+        ops = [UpdateOne({"id": event_id}, {"$set": {"registered_count": total}}) for event_id, total in totals.items()]
+        if ops:
+            await db.events.bulk_write(ops, ordered=False)
+    except Exception:
+        # Retry these events on the next flush
+        counter_flush_stats["failures"] += 1
+        pending_count_events |= batch
+        raise
+    counter_flush_stats["flushes"] += 1
+    counter_flush_stats["flushed_events"] += len(batch)
+
+async def count_delta_flusher():
+    try:
+        while True:
+            await asyncio.sleep(COUNTER_FLUSH_SECONDS)
+            try:
+                await flush_count_deltas()
+            except Exception as e:
+                logger.error(f"registered_count flush failed: {e}")
+    finally:
+        await flush_count_deltas()
+
+OPEN_EVENT = {"is_active": True, "is_registration_open": {"$ne": False}}
+
+async def reserve_seat(event_id: str) -> Optional[dict]:
+    if SEAT_COUNTER_SHARDS > 1:
+        # Plain read of the event; only the counter slot is written. The
+        # returned document carries the counter_gen the seat was taken in.
+        event = await db.events.find_one({"id": event_id, **OPEN_EVENT}, {"_id": 0})
+        if not event or not await take_counter_slot(event):
+            return None
+        mark_count_changed(event_id)
+        return event
+    
+    # One conditional update both checks and takes the seat, so concurrent
+    # requests can never push registered_count past capacity
+    return await db.events.find_one_and_update(
+        {"id": event_id, **OPEN_EVENT, "$expr": SEAT_AVAILABLE_EXPR},
+        {"$inc": {"registered_count": 1}},
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER
+    )
+
+async def recheck_seat(event: dict) -> bool:
+    # Sharded counters only: confirm, after the registration is inserted,
+    # that the event is still open and the seat's generation still current.
+    # If the counters were reset meanwhile, move the seat to the new one:
+    # seeding it now counts this registration, otherwise take a slot. (A
+    # reseed racing this one may count it as well, which holds a seat back
+    # until the next resync but never admits past capacity.)
+    current = await db.events.find_one({"id": event["id"], **OPEN_EVENT}, {"_id": 0})
+    if current is None:
+        return False
+    gen = current.get("counter_gen", 0)
+    if gen == event.get("counter_gen", 0):
+        return True
+    counter_flush_stats["rechecked_seats"] += 1
+    if not await db.event_counters.count_documents({"event_id": event["id"], "gen": gen}, limit=1):
+        await seed_counter_slots(current)
+    elif not await take_counter_slot(current):
+        return False
+    event["counter_gen"] = gen
+    return True
+
+async def release_seat(event_id: str, gen: Optional[int] = None):
+    if SEAT_COUNTER_SHARDS > 1:
+        await return_counter_slot(event_id, await current_counter_gen(event_id) if gen is None else gen)
+        mark_count_changed(event_id)
+        return
+    await db.events.update_one(
+        {"id": event_id, "registered_count": {"$gt": 0}},
+        {"$inc": {"registered_count": -1}}
+    )
+
+# Per-user, per-sub-fest counters in db.registration_quotas, unique on
+# (student_email, sub_fest). A missing counter is seeded from registrations on
+# first use, so deleting them all is a safe way to resync.
+async def reserve_quota(email: str, sub_fest: str, max_allowed: int) -> bool:
+    key = {"student_email": email, "sub_fest": sub_fest}
+    result = await db.registration_quotas.update_one({**key, "count": {"$lt": max_allowed}}, {"$inc": {"count": 1}})
+    if result.modified_count:
+        return True
+    if await db.registration_quotas.count_documents(key, limit=1):
+        return False
+    
+    existing = await db.registrations.count_documents(key)
+    try:
+        await db.registration_quotas.insert_one({**key, "count": existing})
+    except DuplicateKeyError:
+        pass  # Seeded concurrently by another request
+    result = await db.registration_quotas.update_one({**key, "count": {"$lt": max_allowed}}, {"$inc": {"count": 1}})
+    return bool(result.modified_count)
+
+async def release_quota(email: str, sub_fest: str):
+    await db.registration_quotas.update_one(
+        {"student_email": email, "sub_fest": sub_fest, "count": {"$gt": 0}},
+        {"$inc": {"count": -1}}
+    )
+
+async def admission_error(event_id: str, email: str) -> HTTPException:
+    # Work out why admission failed (only on the rejection path)
+    event = await db.events.find_one({"id": event_id, "is_active": True}, {"_id": 0, "is_registration_open": 1})
     if not event:
-        raise HTTPException(status_code=404, detail="Event not found")
+        return HTTPException(status_code=404, detail="Event not found")
     
     # Check manual registration toggle
     if not event.get('is_registration_open', True):
-         raise HTTPException(status_code=400, detail="Registration for this event is currently closed by admin")
+        return HTTPException(status_code=400, detail="Registration for this event is currently closed by admin")
     
-    # Check if already registered
-    existing = await db.registrations.find_one({"event_id": registration.event_id, "student_email": user['email']}, {"_id": 0})
+    existing = await db.registrations.find_one({"event_id": event_id, "student_email": email}, {"_id": 1})
     if existing:
-        raise HTTPException(status_code=400, detail="Already registered for this event")
+        return HTTPException(status_code=400, detail="Already registered for this event")
+    return HTTPException(status_code=400, detail="This event is full")
+
+# Registration endpoints
+@api_router.post("/registrations", response_model=RegistrationResponse)
+async def register_for_event(registration: EventRegistration, user: dict = Depends(get_current_user)):
+    if not unique_index_ready("registrations", [("event_id", 1), ("student_email", 1)]):
+        existing = await db.registrations.find_one({"event_id": registration.event_id, "student_email": user['email']}, {"_id": 1})
+        if existing:
+            raise HTTPException(status_code=400, detail="Already registered for this event")
     
-    # Check participation limit per sub-fest
-    SUB_FEST_LIMITS = {
-        "TECHNOLOGY-ANWESH": 2,
-        "CULTURAL-AKANKSHA": 2,
-        "SPORTS-AHWAAN": 4
-    }
+    # Take a seat first; the returned document is the event itself
+    event = await reserve_seat(registration.event_id)
+    if not event:
+        raise await admission_error(registration.event_id, user['email'])
     
+    # Check participation limit per sub-fest
     sub_fest = event.get('sub_fest')
-    max_allowed = SUB_FEST_LIMITS.get(sub_fest, 2) # Default to 2 if unknown
-    
-    # Count existing registrations for this sub_fest
-    # We need to find all registrations for this user, then look up the events to check their sub_fest
-    user_registrations = await db.registrations.find({"student_email": user['email']}).to_list(100)
-    
-    count_in_subfest = 0
-    for reg in user_registrations:
-        if reg['event_id'] == registration.event_id: continue # Should be caught by existing check, but just in case
-        
-        reg_event = await db.events.find_one({"id": reg['event_id']}, {"sub_fest": 1})
-        if reg_event and reg_event.get('sub_fest') == sub_fest:
-            count_in_subfest += 1
-            
-    if count_in_subfest >= max_allowed:
+    limits = await get_sub_fest_limits()
+    max_allowed = limits.get(sub_fest, DEFAULT_SUB_FEST_LIMIT)
+    
+    if not await reserve_quota(user['email'], sub_fest, max_allowed):
+        await release_seat(registration.event_id, event.get("counter_gen", 0))
+        # A repeat registration at the quota should still read as a duplicate
+        existing = await db.registrations.find_one({"event_id": registration.event_id, "student_email": user['email']}, {"_id": 1})
+        if existing:
+            raise HTTPException(status_code=400, detail="Already registered for this event")
         raise HTTPException(status_code=400, detail=f"You can only register for {max_allowed} events in {sub_fest}")
     
     # Create registration
@@ -768,7 +2249,7 @@ async def register_for_event(registration: EventRegistration, user: dict = Depen
             "id": f"reg-{secrets.token_hex(8)}",
             "event_id": registration.event_id,
             "student_email": user['email'],
-            "registered_at": datetime.now(timezone.utc).isoformat(),
+            "registered_at": datetime.now(timezone.utc),
             "event_name": event['name'],
             "sub_fest": event['sub_fest'],
             "full_name": user['full_name'],
@@ -790,154 +2271,292 @@ async def register_for_event(registration: EventRegistration, user: dict = Depen
              else:
                  reg_dict['team_members'] = []
     
+        # The unique (event_id, student_email) index rejects double registrations
         await db.registrations.insert_one(reg_dict)
-        await db.events.update_one({"id": registration.event_id}, {"$inc": {"registered_count": 1}})
-    
-        return RegistrationResponse(**{**reg_dict, 'registered_at': datetime.fromisoformat(reg_dict['registered_at'])})
+    except DuplicateKeyError:
+        await release_seat(registration.event_id, event.get("counter_gen", 0))
+        await release_quota(user['email'], sub_fest)
+        raise HTTPException(status_code=400, detail="Already registered for this event")
     except Exception as e:
         print(f"Error during registration: {str(e)}") # Log to Railway console
+        await release_seat(registration.event_id, event.get("counter_gen", 0))
+        await release_quota(user['email'], sub_fest)
         if isinstance(e, HTTPException):
             raise e
         raise HTTPException(status_code=500, detail=f"Server error: {str(e)}")
+    
+    if SEAT_COUNTER_SHARDS > 1 and not await recheck_seat(event):
+        # Closed, deleted, or reset and now full while this request was in flight
+        await db.registrations.delete_one({"id": reg_dict["id"]})
+        await release_seat(registration.event_id, event.get("counter_gen", 0))
+        await release_quota(user['email'], sub_fest)
+        raise await admission_error(registration.event_id, user['email'])
+    
+    return RegistrationResponse(**reg_dict)
 
 @api_router.get("/registrations/my", response_model=List[RegistrationResponse])
 async def get_my_registrations(user: dict = Depends(get_current_user)):
     registrations = await db.registrations.find({"student_email": user['email']}, {"_id": 0}).to_list(1000)
-    
-    for reg in registrations:
-        if isinstance(reg['registered_at'], str):
-            reg['registered_at'] = datetime.fromisoformat(reg['registered_at'])
-    
-    return [RegistrationResponse(**reg) for reg in registrations]
+    return json_bytes_response(serialize(registration_list_adapter, registrations))
+
+# Admin registration list. Pages are keyset-paginated on (registered_at, _id)
+# and read in index order (see REQUIRED_INDEXES for which filters get their
+# own range); the cursor for the next page comes back in X-Next-Cursor /
+# Link. Without a limit one page holds up to REGISTRATIONS_MAX_PAGE rows,
+# which is what the dashboard loads today.
+REGISTRATIONS_MAX_PAGE = 10000
+EXPORT_USER_FIELDS = ["full_name", "roll_number", "department", "year", "mobile_number"]
+REGISTRATION_FIELDS = ["id", "event_id", "student_email", "team_members", "registered_at", "event_name", "sub_fest", "selected_sub_events", *EXPORT_USER_FIELDS]
+
+# Opaque keyset cursors: a timestamp plus a tie-breaking key
+def encode_cursor(at: datetime, key: Any) -> str:
+    packed = orjson.dumps([at, str(key)])
+    return base64.urlsafe_b64encode(packed).decode().rstrip("=")
+
+def decode_cursor(cursor: str, key_type=ObjectId) -> tuple:
+    try:
+        at, key = orjson.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return datetime.fromisoformat(at), key_type(key)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
 
 @api_router.get("/registrations", response_model=List[Dict[str, Any]])
-async def get_all_registrations(admin: dict = Depends(get_admin_user)):
-    registrations = await db.registrations.find({}, {"_id": 0}).to_list(10000)
+async def get_all_registrations(
+    request: Request,
+    event_id: Optional[str] = None,
+    sub_fest: Optional[str] = None,
+    department: Optional[str] = None,
+    year: Optional[int] = None,
+    registered_from: Optional[datetime] = None,
+    registered_to: Optional[datetime] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
+    limit: int = Query(REGISTRATIONS_MAX_PAGE, ge=1, le=REGISTRATIONS_MAX_PAGE),
+    cursor: Optional[str] = None,
+    admin: dict = Depends(get_admin_user)
+):
+    selected = REGISTRATION_FIELDS
+    if fields:
+        selected = [field.strip() for field in fields.split(",") if field.strip()]
+        unknown = set(selected) - set(REGISTRATION_FIELDS)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    
+    query = {}
+    for field, value in (("event_id", event_id), ("sub_fest", sub_fest), ("department", department), ("year", year)):
+        if value is not None:
+            query[field] = value
+    if registered_from or registered_to:
+        query["registered_at"] = {}
+        if registered_from:
+            query["registered_at"]["$gte"] = registered_from
+        if registered_to:
+            query["registered_at"]["$lt"] = registered_to
+    if cursor:
+        after_at, after_id = decode_cursor(cursor)
+        query = {"$and": [query, {"$or": [
+            {"registered_at": {"$gt": after_at}},
+            {"registered_at": after_at, "_id": {"$gt": after_id}},
+        ]}]}
+    
+    # registered_at and student_email are needed for the cursor and enrichment
+    enrich = [field for field in EXPORT_USER_FIELDS if field in selected]
+    projection = {field: 1 for field in (*selected, "registered_at", "student_email")}
+    registrations = await db.registrations.find(query, projection).sort(
+        [("registered_at", 1), ("_id", 1)]
+    ).limit(limit + 1).to_list(limit + 1)
+    
+    headers = {}
+    if len(registrations) > limit:
+        registrations = registrations[:limit]
+        next_cursor = encode_cursor(registrations[-1]["registered_at"], registrations[-1]["_id"])
+        headers["X-Next-Cursor"] = next_cursor
+        headers["Link"] = f'<{request.url.include_query_params(cursor=next_cursor)}>; rel="next"'
+    
+    # Batch fetch this page's users for their current profile. Filters match
+    # the values recorded at registration.
+    users_map = {}
+    if enrich and registrations:
+        user_emails = list({reg["student_email"] for reg in registrations if reg.get("student_email")})
+        users_cursor = db.users.find({"email": {"$in": user_emails}}, {"_id": 0, "email": 1, **{field: 1 for field in enrich}})
+        users_map = {user["email"]: user async for user in users_cursor}
     
-    if not registrations:
-        return []
-
-    # Batch fetch users logic
-    user_emails = [reg.get("student_email") for reg in registrations if reg.get("student_email")]
-    users_cursor = db.users.find({"email": {"$in": user_emails}}, {"_id": 0})
-    users_map = {user["email"]: user async for user in users_cursor}
-
     for reg in registrations:
         user = users_map.get(reg.get("student_email"))
         if user:
-            reg.update({
-                "full_name": user.get("full_name"),
-                "roll_number": user.get("roll_number"),
-                "department": user.get("department"),
-                "year": user.get("year"),
-                "mobile_number": user.get("mobile_number")
-            })
-    return registrations
+            reg.update({field: user.get(field) for field in enrich})
+        for field in [key for key in reg if key not in selected]:
+            del reg[field]
+    return ORJSONResponse(registrations, headers=headers)
 
 @api_router.delete("/registrations/{registration_id}")
 async def delete_registration(registration_id: str, admin: dict = Depends(get_admin_user)):
-    reg = await db.registrations.find_one({"id": registration_id})
+    reg = await db.registrations.find_one_and_delete({"id": registration_id})
     if not reg:
         raise HTTPException(status_code=404, detail="Registration not found")
         
-    await db.registrations.delete_one({"id": registration_id})
-    # Decrement count safely
-    await db.events.update_one(
-        {"id": reg["event_id"], "registered_count": {"$gt": 0}}, 
-        {"$inc": {"registered_count": -1}}
-    )
+    # Decrement counts safely
+    await release_seat(reg["event_id"])
+    if reg.get("sub_fest"):
+        await release_quota(reg["student_email"], reg["sub_fest"])
     
     return {"message": "Registration deleted successfully"}
 
+# Exports walk the collection with a batched cursor and join the student's
+# current profile with a $lookup on the unique users.email index, so memory
+# stays flat and the first bytes go out as soon as the first batch is read.
+EXPORT_BATCH_SIZE = int(os.environ.get('EXPORT_BATCH_SIZE', '500'))
+
+def registrations_with_users(query: dict, extra_stages: tuple = ()):
+    pipeline = [
+        {"$match": query},
+        {"$lookup": {"from": "users", "localField": "student_email", "foreignField": "email", "as": "user"}},
+        # Fall back to the snapshot taken at registration if the user is gone
+        {"$addFields": {
+            field: {"$ifNull": [{"$arrayElemAt": [f"$user.{field}", 0]}, f"${field}"]}
+            for field in EXPORT_USER_FIELDS
+        }},
+        *extra_stages,
+        {"$project": {"_id": 0, "user": 0}},
+    ]
+    return db.registrations.aggregate(pipeline, batchSize=EXPORT_BATCH_SIZE)
+
+REGISTRATION_CSV_HEADERS = ["Full Name", "Event", "Sub-Fest", "Date", "Roll No", "Dept", "Year", "Mobile", "Email", "Team Members", "Robotics Sub-Events"]
+
+def registration_csv_row(reg: dict) -> list:
+    team_str = ""
+    if reg.get('team_members'):
+        team_str = "; ".join([f"{m['full_name']} ({m['roll_number']})" for m in reg['team_members']])
+    
+    # Format sub-events
+    sub_events_str = ""
+    if reg.get('selected_sub_events'):
+        sub_events_str = ", ".join(reg['selected_sub_events']) if isinstance(reg['selected_sub_events'], list) else str(reg['selected_sub_events'])
+    
+    return [
+        reg.get('full_name', ''),
+        reg.get('event_name', ''),
+        reg.get('sub_fest', ''),
+        reg['registered_at'].isoformat() if isinstance(reg.get('registered_at'), datetime) else reg.get('registered_at', ''),
+        reg.get('roll_number', ''),
+        reg.get('department', ''),
+        reg.get('year', ''),
+        reg.get('mobile_number', ''),
+        reg.get('student_email', ''),
+        team_str,
+        sub_events_str
+    ]
+
+async def stream_registrations_csv(query: dict):
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(REGISTRATION_CSV_HEADERS)
+    rows = 0
+    async for reg in registrations_with_users(query):
+        writer.writerow(registration_csv_row(reg))
+        rows += 1
+        # Flush once per cursor batch
+        if rows % EXPORT_BATCH_SIZE == 0:
+            yield output.getvalue().encode()
+            output.seek(0)
+            output.truncate()
+    if output.tell():
+        yield output.getvalue().encode()
+
 @api_router.get("/registrations/export")
 async def export_registrations(event_id: Optional[str] = None, admin: dict = Depends(get_admin_user)):
     query = {}
     if event_id:
         query["event_id"] = event_id
-        
-    registrations = await db.registrations.find(query, {"_id": 0}).to_list(10000)
     
-    if not registrations:
-        return Response(content="No registrations found", media_type="text/csv")
-
-    # Batch fetch users to optimize speed
-    user_emails = [reg.get("student_email") for reg in registrations if reg.get("student_email")]
-    users_cursor = db.users.find({"email": {"$in": user_emails}}, {"_id": 0})
-    users_map = {user["email"]: user async for user in users_cursor}
-
-    output = io.StringIO()
-    writer = csv.writer(output)
-    
-    # Headers
-    headers = ["Full Name", "Event", "Sub-Fest", "Date", "Roll No", "Dept", "Year", "Mobile", "Email", "Team Members", "Robotics Sub-Events"]
-    writer.writerow(headers)
-    
-    for reg in registrations:
-        # Enrichment from map
-        user = users_map.get(reg.get("student_email"))
-        if user:
-            reg.update({
-                "full_name": user.get("full_name"),
-                "roll_number": user.get("roll_number"),
-                "department": user.get("department"),
-                "year": user.get("year"),
-                "mobile_number": user.get("mobile_number")
-            })
-                
-        team_str = ""
-        if reg.get('team_members'):
-            team_str = "; ".join([f"{m['full_name']} ({m['roll_number']})" for m in reg['team_members']])
-        
-        # Format sub-events
-        sub_events_str = ""
-        if reg.get('selected_sub_events'):
-            sub_events_str = ", ".join(reg['selected_sub_events']) if isinstance(reg['selected_sub_events'], list) else str(reg['selected_sub_events'])
-
-        writer.writerow([
-            reg.get('full_name', ''),
-            reg.get('event_name', ''),
-            reg.get('sub_fest', ''),
-            reg.get('registered_at', ''),
-            reg.get('roll_number', ''),
-            reg.get('department', ''),
-            reg.get('year', ''),
-            reg.get('mobile_number', ''),
-            reg.get('student_email', ''),
-            team_str,
-            sub_events_str
-        ])
-
-        
-    output.seek(0)
     filename = f"registrations_{event_id}.csv" if event_id else "all_registrations.csv"
-    return Response(content=output.getvalue(), media_type="text/csv", headers={"Content-Disposition": f"attachment; filename={filename}"})
+    return StreamingResponse(
+        stream_registrations_csv(query),
+        media_type="text/csv",
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
 
 # Notification endpoints
 @api_router.post("/notifications", response_model=NotificationResponse)
 async def create_notification(notification: NotificationCreate, admin: dict = Depends(get_admin_user)):
     notif_dict = notification.model_dump()
-    notif_dict['id'] = f"notif-{datetime.now(timezone.utc).timestamp()}"
-    notif_dict['created_at'] = datetime.now(timezone.utc).isoformat()
+    notif_dict['id'] = f"notif-{secrets.token_hex(8)}"
+    notif_dict['created_at'] = datetime.now(timezone.utc)
     
     await db.notifications.insert_one(notif_dict)
+    public_cache.invalidate("notifications")
     
-    return NotificationResponse(**{**notif_dict, 'created_at': datetime.fromisoformat(notif_dict['created_at'])})
+    return NotificationResponse(**notif_dict)
+
+# Newest first, keyset-paginated on (created_at, id) over the matching
+# index. `before` pages back through older notifications; `since` is the
+# delta mode for polling clients and returns what is newer than the token
+# (or ISO timestamp) oldest first, with X-Sync-Token for the next poll.
+# Without a limit the response is the full list, as before.
+NOTIFICATIONS_MAX_LIMIT = 100
+NOTIFICATION_SORT = [("created_at", -1), ("id", -1)]
+
+def notification_key(value: str) -> tuple:
+    try:
+        at = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        return (at if at.tzinfo else at.replace(tzinfo=timezone.utc)), ""
+    except ValueError:
+        return decode_cursor(value, str)
 
 @api_router.get("/notifications", response_model=List[NotificationResponse])
-async def get_notifications():
-    notifications = await db.notifications.find({}, {"_id": 0}).sort("created_at", -1).to_list(1000)
-    
-    for notif in notifications:
-        if isinstance(notif['created_at'], str):
-            notif['created_at'] = datetime.fromisoformat(notif['created_at'])
+async def get_notifications(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=NOTIFICATIONS_MAX_LIMIT),
+    before: Optional[str] = None,
+    since: Optional[str] = None
+):
+    if before and since:
+        raise HTTPException(status_code=400, detail="Use either before or since, not both")
+    if since:
+        return await get_notifications_since(since, limit or NOTIFICATIONS_MAX_LIMIT)
+    if before is None and limit is None:
+        return await cached_json(request, "notifications", load_notifications)
     
-    return [NotificationResponse(**notif) for notif in notifications]
+    query = {}
+    if before:
+        at, notif_id = notification_key(before)
+        query = {"$or": [{"created_at": {"$lt": at}}, {"created_at": at, "id": {"$lt": notif_id}}]}
+    limit = limit or NOTIFICATIONS_MAX_LIMIT
+    notifications = await db.notifications.find(query, {"_id": 0}).sort(NOTIFICATION_SORT).limit(limit + 1).to_list(limit + 1)
+    
+    headers = {}
+    if len(notifications) > limit:
+        notifications = notifications[:limit]
+        next_cursor = encode_cursor(notifications[-1]["created_at"], notifications[-1]["id"])
+        headers["X-Next-Cursor"] = next_cursor
+        headers["Link"] = f'<{request.url.include_query_params(before=next_cursor)}>; rel="next"'
+    return Response(content=serialize(notification_list_adapter, notifications), media_type="application/json", headers=headers)
+
+async def get_notifications_since(since: str, limit: int) -> Response:
+    at, notif_id = notification_key(since)
+    notifications = await db.notifications.find(
+        {"$or": [{"created_at": {"$gt": at}}, {"created_at": at, "id": {"$gt": notif_id}}]}, {"_id": 0}
+    ).sort([("created_at", 1), ("id", 1)]).limit(limit).to_list(limit)
+    
+    if notifications:
+        sync_token = encode_cursor(notifications[-1]["created_at"], notifications[-1]["id"])
+    else:
+        sync_token = encode_cursor(at, notif_id)
+    return Response(
+        content=serialize(notification_list_adapter, notifications),
+        media_type="application/json",
+        headers={"X-Sync-Token": sync_token, "Cache-Control": "no-cache"}
+    )
+
+async def load_notifications():
+    notifications = await db.notifications.find({}, {"_id": 0}).sort(NOTIFICATION_SORT).to_list(1000)
+    return serialize(notification_list_adapter, notifications)
 
 @api_router.delete("/notifications/{notification_id}")
 async def delete_notification(notification_id: str, admin: dict = Depends(get_admin_user)):
     result = await db.notifications.delete_one({"id": notification_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Notification not found")
+    public_cache.invalidate("notifications")
     return {"message": "Notification deleted successfully"}
 
 # Gallery endpoints
@@ -945,66 +2564,81 @@ async def delete_notification(notification_id: str, admin: dict = Depends(get_ad
 async def add_gallery_image(image: GalleryImageCreate, admin: dict = Depends(get_admin_user)):
     image_dict = image.model_dump()
     image_dict['id'] = f"img-{datetime.now(timezone.utc).timestamp()}"
-    image_dict['uploaded_at'] = datetime.now(timezone.utc).isoformat()
+    image_dict['uploaded_at'] = datetime.now(timezone.utc)
     
     await db.gallery.insert_one(image_dict)
+    public_cache.invalidate("gallery")
     
-    return GalleryImageResponse(**{**image_dict, 'uploaded_at': datetime.fromisoformat(image_dict['uploaded_at'])})
+    return GalleryImageResponse(**image_dict)
 
 @api_router.get("/gallery", response_model=List[GalleryImageResponse])
-async def get_gallery(sub_fest: Optional[str] = None):
+async def get_gallery(request: Request, sub_fest: Optional[str] = None):
+    if sub_fest and sub_fest not in SUB_FEST_LIMITS:
+        # Only known sub-fests get a cache entry
+        payload = await load_gallery(sub_fest)
+        return conditional_json(request, payload, make_etag(payload))
+    return await cached_json(request, f"gallery:{sub_fest or ''}", lambda: load_gallery(sub_fest))
+
+async def load_gallery(sub_fest: Optional[str]):
     query = {}
     if sub_fest:
         query['sub_fest'] = sub_fest
     
     images = await db.gallery.find(query, {"_id": 0}).to_list(1000)
-    
-    for img in images:
-        if isinstance(img['uploaded_at'], str):
-            img['uploaded_at'] = datetime.fromisoformat(img['uploaded_at'])
-    
-    return [GalleryImageResponse(**img) for img in images]
+    return serialize(gallery_list_adapter, images)
 
 # Shortlist endpoints
 # Shortlist endpoints
 @api_router.post("/shortlist/upload")
-async def upload_shortlist(file: UploadFile = File(...), title: str = Form(...), admin: dict = Depends(get_admin_user)):
-    if not file.filename.endswith(('.xlsx', '.xls')):
-        raise HTTPException(status_code=400, detail="Only Excel files allowed")
-    
-    try:
-        contents = await file.read()
-        df = pd.read_excel(BytesIO(contents))
-        
-        # Clean dataframe - replace nan with None/empty string for JSON compatibility
-        df = df.where(pd.notnull(df), None)
-        
-        # Insert new shortlist document
-        records = df.to_dict('records')
-        
-        shortlist_id = f"list-{secrets.token_hex(4)}"
-        shortlist_doc = {
-            "id": shortlist_id,
-            "title": title,
-            "uploaded_at": datetime.now(timezone.utc).isoformat(),
-            "entries": records
-        }
+async def upload_shortlist(request: Request, admin: dict = Depends(get_admin_user)):
+    # Excel needs a seekable file, so the upload is spooled (to disk past 1MB)
+    # rather than buffered whole in memory
+    with tempfile.SpooledTemporaryFile(max_size=1024 * 1024) as spool:
+        async def write_chunk(chunk: bytes):
+            spool.write(chunk)
         
-        await db.shortlists.insert_one(shortlist_doc)
+        try:
+            fields = await stream_multipart(request, "file", (".xlsx", ".xls"), SHORTLIST_MAX_BYTES, write_chunk)
+        except UploadTooLarge:
+            raise too_large(SHORTLIST_MAX_BYTES)
+        title = fields.get("title", "").strip()
+        if not title:
+            raise HTTPException(status_code=400, detail="Shortlist title is required")
         
-        return {"message": f"Uploaded '{title}' with {len(records)} entries", "count": len(records), "id": shortlist_id}
-    except Exception as e:
-        logger.error(f"Error processing upload: {e}")
-        raise HTTPException(status_code=400, detail=f"Error processing file: {str(e)}")
+        try:
+            spool.seek(0)
+            df = await asyncio.to_thread(pd.read_excel, spool)
+            
+            # Clean dataframe - replace nan with None/empty string for JSON compatibility
+            df = df.where(pd.notnull(df), None)
+            
+            # Insert new shortlist document
+            records = df.to_dict('records')
+            
+            shortlist_id = f"list-{secrets.token_hex(4)}"
+            shortlist_doc = {
+                "id": shortlist_id,
+                "title": title,
+                "uploaded_at": datetime.now(timezone.utc),
+                "entries": records
+            }
+            
+            await db.shortlists.insert_one(shortlist_doc)
+            public_cache.invalidate("shortlists")
+            
+            return {"message": f"Uploaded '{title}' with {len(records)} entries", "count": len(records), "id": shortlist_id}
+        except Exception as e:
+            logger.error(f"Error processing upload: {e}")
+            raise HTTPException(status_code=400, detail=f"Error processing file: {str(e)}")
 
 @api_router.get("/shortlists")
-async def get_shortlists():
+async def get_shortlists(request: Request):
+    return await cached_json(request, "shortlists", load_shortlists)
+
+async def load_shortlists():
     # Return list of shortlists without the full entries data to save bandwidth
     shortlists = await db.shortlists.find({}, {"entries": 0, "_id": 0}).sort("uploaded_at", -1).to_list(100)
-    for s in shortlists:
-        if isinstance(s.get('uploaded_at'), str):
-            s['uploaded_at'] = datetime.fromisoformat(s['uploaded_at'])
-    return shortlists
+    return orjson.dumps(shortlists)
 
 @api_router.get("/shortlists/{shortlist_id}")
 async def get_shortlist_details(shortlist_id: str):
@@ -1012,9 +2646,6 @@ async def get_shortlist_details(shortlist_id: str):
     if not shortlist:
         raise HTTPException(status_code=404, detail="Shortlist not found")
         
-    if isinstance(shortlist.get('uploaded_at'), str):
-        shortlist['uploaded_at'] = datetime.fromisoformat(shortlist['uploaded_at'])
-        
     return shortlist
 
 @api_router.delete("/shortlists/{shortlist_id}")
@@ -1022,54 +2653,262 @@ async def delete_shortlist(shortlist_id: str, admin: dict = Depends(get_admin_us
     result = await db.shortlists.delete_one({"id": shortlist_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Shortlist not found")
+    public_cache.invalidate("shortlists")
     return {"message": "Shortlist deleted successfully"}
 
 # Data export endpoints
+EXPORT_COLUMNS = ["id", "event_id", "registered_at", "full_name", "email", "mobile_number", "roll_number", "selected_sub_events"]
+EXPORT_SCHEMA = pa.schema([
+    ("id", pa.string()),
+    ("event_id", pa.string()),
+    ("registered_at", pa.timestamp("us", tz="UTC")),
+    ("full_name", pa.string()),
+    ("email", pa.string()),
+    ("mobile_number", pa.string()),
+    ("roll_number", pa.string()),
+    ("selected_sub_events", pa.string()),
+])
+
+def export_row(reg: dict) -> list:
+    sub_events = reg.get("selected_sub_events")
+    # Coerced like snapshot_row: a stray number in a text column would
+    # otherwise fail the Parquet stream after it has started
+    return [
+        as_text(reg.get("id")),
+        as_text(reg.get("event_id")),
+        as_datetime(reg.get("registered_at")),
+        as_text(reg.get("full_name")),
+        as_text(reg.get("student_email")),
+        as_text(reg.get("mobile_number")),
+        as_text(reg.get("roll_number")),
+        # Format selected_sub_events list to readable string
+        ", ".join(map(str, sub_events)) if isinstance(sub_events, list) else as_text(sub_events),
+    ]
+
+async def registration_export_batches(make_row=export_row, extra_stages: tuple = (), batch_size: int = EXPORT_BATCH_SIZE):
+    batch = []
+    async for reg in registrations_with_users({}, extra_stages):
+        batch.append(make_row(reg))
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+class ChunkSink(io.RawIOBase):
+    # Write-only file that hands back what was written since the last drain,
+    # for writers (Parquet) that only ever append but want a file object
+    def __init__(self):
+        self.parts = []
+        self.position = 0
+    
+    def writable(self):
+        return True
+    
+    def write(self, data):
+        self.parts.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+    
+    def tell(self):
+        return self.position
+    
+    def drain(self) -> bytes:
+        data = b"".join(self.parts)
+        self.parts = []
+        return data
+
+async def export_csv(batches):
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(EXPORT_COLUMNS)
+    async for batch in batches:
+        for row in batch:
+            row[2] = row[2].isoformat() if isinstance(row[2], datetime) else row[2]
+        writer.writerows(batch)
+        yield output.getvalue().encode()
+        output.seek(0)
+        output.truncate()
+    if output.tell():
+        yield output.getvalue().encode()
+
+async def export_jsonl(batches):
+    async for batch in batches:
+        yield b"".join(orjson.dumps(dict(zip(EXPORT_COLUMNS, row))) + b"\n" for row in batch)
+
+async def export_parquet(batches):
+    # One row group per cursor batch; the footer is written on close
+    sink = ChunkSink()
+    writer = pq.ParquetWriter(sink, EXPORT_SCHEMA, compression="zstd")
+    async for batch in batches:
+        table = pa.Table.from_pylist([dict(zip(EXPORT_COLUMNS, row)) for row in batch], schema=EXPORT_SCHEMA)
+        await asyncio.to_thread(writer.write_table, table)
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+async def export_xlsx(batches):
+    # xlsx is a zip that can only be finalized once every row is in; the
+    # write-only workbook keeps rows in a temp file instead of in memory
+    with tempfile.TemporaryFile() as f:
+        workbook = openpyxl.Workbook(write_only=True)
+        sheet = workbook.create_sheet("Registrations")
+        sheet.append(EXPORT_COLUMNS)
+        async for batch in batches:
+            for row in batch:
+                # Excel cannot store timezone-aware datetimes
+                row[2] = row[2].replace(tzinfo=None) if isinstance(row[2], datetime) else row[2]
+                sheet.append(row)
+        await asyncio.to_thread(workbook.save, f)
+        f.seek(0)
+        while True:
+            data = await asyncio.to_thread(f.read, FILE_CHUNK_SIZE)
+            if not data:
+                break
+            yield data
+
+EXPORT_FORMATS = {
+    "csv": (export_csv, "text/csv"),
+    "jsonl": (export_jsonl, "application/x-ndjson"),
+    "parquet": (export_parquet, "application/vnd.apache.parquet"),
+    "xlsx": (export_xlsx, "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+}
+
 @api_router.get("/export/registrations")
 async def export_registrations(format: str = Query("csv"), admin: dict = Depends(get_admin_user)):
-    # Get all registrations with user details
-    registrations = await db.registrations.find({}, {"_id": 0}).to_list(10000)
-    
-    if not registrations:
-        raise HTTPException(status_code=404, detail="No registrations found")
-    
-    # Enhance with user details
-    for reg in registrations:
-        if reg.get("student_email"):
-            user = await db.users.find_one({"email": reg["student_email"]}, {"_id": 0})
-            if user:
-                reg.update({
-                    "full_name": user.get("full_name"),
-                    "roll_number": user.get("roll_number"),
-                    "department": user.get("department"),
-                    "year": user.get("year"),
-                    "mobile_number": user.get("mobile_number")
-                })
-    
-    # Convert to dataframe
-    df = pd.DataFrame(registrations)
-    
-    # Select columns
-    columns = ["id", "event_id", "registered_at", "full_name", "email", "mobile_number", "roll_number", "selected_sub_events"]
-    
-    # Ensure all columns exist
-    for col in columns:
-        if col not in df.columns:
-            df[col] = None
-            
-    # Format selected_sub_events list to readable string
-    if "selected_sub_events" in df.columns:
-        df['selected_sub_events'] = df['selected_sub_events'].apply(lambda x: ", ".join(x) if isinstance(x, list) else x)
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported format; use one of {', '.join(EXPORT_FORMATS)}")
+    
+    writer, media_type = EXPORT_FORMATS[format]
+    return StreamingResponse(
+        writer(registration_export_batches()),
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename=registrations.{format}"}
+    )
 
-    df = df[columns]
-    
-    output = io.StringIO()
-    df.to_csv(output, index=False)
-    
-    return Response(
-        content=output.getvalue(), 
-        media_type="text/csv", 
-        headers={"Content-Disposition": "attachment; filename=registrations.csv"}
+# Columnar snapshot for analytics: registrations joined with the student's
+# profile and the event, low-cardinality columns dictionary-encoded. The
+# Parquet file is cached under EXPORT_SNAPSHOT_DIR keyed by a data version,
+# so repeat downloads are a sendfile until something changes.
+EXPORT_SNAPSHOT_DIR = Path(os.environ.get('EXPORT_SNAPSHOT_DIR', str(ROOT_DIR / 'export_cache')))
+SNAPSHOT_ROW_GROUP_SIZE = int(os.environ.get('SNAPSHOT_ROW_GROUP_SIZE', '20000'))
+SNAPSHOT_MEDIA_TYPE = "application/vnd.apache.parquet"
+CATEGORY = pa.dictionary(pa.int32(), pa.string())
+TEAM_MEMBER = pa.struct([
+    ("full_name", pa.string()),
+    ("email", pa.string()),
+    ("roll_number", pa.string()),
+    ("department", pa.string()),
+    ("year", pa.int32()),
+])
+SNAPSHOT_SCHEMA = pa.schema([
+    ("id", pa.string()),
+    ("event_id", CATEGORY),
+    ("event_name", CATEGORY),
+    ("sub_fest", CATEGORY),
+    ("event_type", CATEGORY),
+    ("venue", CATEGORY),
+    ("registered_at", pa.timestamp("us", tz="UTC")),
+    ("student_email", pa.string()),
+    ("full_name", pa.string()),
+    ("roll_number", pa.string()),
+    ("department", CATEGORY),
+    ("year", pa.int32()),
+    ("mobile_number", pa.string()),
+    ("selected_sub_events", pa.list_(pa.string())),
+    ("team_size", pa.int32()),
+    ("team_members", pa.list_(TEAM_MEMBER)),
+])
+SNAPSHOT_EVENT_STAGES = (
+    {"$lookup": {"from": "events", "localField": "event_id", "foreignField": "id", "as": "event"}},
+    {"$addFields": {
+        "event_name": {"$ifNull": [{"$arrayElemAt": ["$event.name", 0]}, "$event_name"]},
+        "sub_fest": {"$ifNull": [{"$arrayElemAt": ["$event.sub_fest", 0]}, "$sub_fest"]},
+        "event_type": {"$arrayElemAt": ["$event.event_type", 0]},
+        "venue": {"$arrayElemAt": ["$event.venue", 0]},
+    }},
+    {"$project": {"event": 0}},
+)
+# Event fields the snapshot copies; editing anything else leaves it valid
+SNAPSHOT_EVENT_FIELDS = {"name", "sub_fest", "event_type", "venue"}
+# A replaced snapshot may still be mid-download, so old files are only
+# removed once they are this old
+SNAPSHOT_KEEP_SECONDS = float(os.environ.get('SNAPSHOT_KEEP_SECONDS', '600'))
+snapshot_lock = asyncio.Lock()
+
+def as_int(value) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+def snapshot_row(reg: dict) -> dict:
+    team = reg.get("team_members") or []
+    sub_events = reg.get("selected_sub_events")
+    row = {field: as_text(reg.get(field)) for field in SNAPSHOT_SCHEMA.names}
+    row.update({
+        "registered_at": as_datetime(reg.get("registered_at")),
+        "year": as_int(reg.get("year")),
+        "selected_sub_events": sub_events if isinstance(sub_events, list) else ([sub_events] if sub_events else []),
+        "team_size": len(team),
+        "team_members": [
+            {**{key: as_text(m.get(key)) for key in ("full_name", "email", "roll_number", "department")}, "year": as_int(m.get("year"))}
+            for m in team
+        ],
+    })
+    return row
+
+async def bump_snapshot_version():
+    # Registrations are insert/delete only and covered by the fingerprint in
+    # registrations_data_version; profile and event edits bump this marker.
+    # It lives outside db.system, whose changes reset every worker's caches.
+    await db.export_versions.update_one({"type": "registrations_snapshot"}, {"$inc": {"version": 1}}, upsert=True)
+
+async def registrations_data_version() -> str:
+    latest = await db.registrations.find_one({}, {"_id": 1}, sort=[("_id", -1)])
+    count = await db.registrations.estimated_document_count()
+    marker = await db.export_versions.find_one({"type": "registrations_snapshot"}, {"_id": 0, "version": 1}) or {}
+    return f"{count}-{latest['_id'] if latest else 0}-{marker.get('version', 0)}"
+
+async def build_registrations_snapshot(path: Path):
+    tmp = path.with_name(f"{path.stem}.{secrets.token_hex(4)}.tmp")
+    try:
+        writer = pq.ParquetWriter(str(tmp), SNAPSHOT_SCHEMA, compression="zstd")
+        async for batch in registration_export_batches(snapshot_row, SNAPSHOT_EVENT_STAGES, SNAPSHOT_ROW_GROUP_SIZE):
+            table = pa.Table.from_pylist(batch, schema=SNAPSHOT_SCHEMA)
+            await asyncio.to_thread(writer.write_table, table)
+        writer.close()
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+@api_router.get("/export/registrations/snapshot")
+async def export_registrations_snapshot(request: Request, admin: dict = Depends(get_admin_user)):
+    version = await registrations_data_version()
+    etag = f'"{version}"'
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    
+    path = EXPORT_SNAPSHOT_DIR / f"registrations-{version}.parquet"
+    if not path.exists():
+        async with snapshot_lock:
+            if not path.exists():
+                EXPORT_SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
+                await build_registrations_snapshot(path)
+                cutoff = time.time() - SNAPSHOT_KEEP_SECONDS
+                for old in EXPORT_SNAPSHOT_DIR.glob("registrations-*.parquet"):
+                    try:
+                        if old != path and old.stat().st_mtime < cutoff:
+                            old.unlink()
+                    except FileNotFoundError:
+                        pass  # Removed by another worker
+    
+    return FileResponse(
+        path,
+        media_type=SNAPSHOT_MEDIA_TYPE,
+        filename="registrations.parquet",
+        # Parquet is already compressed
+        headers={"ETag": etag, "Cache-Control": "private, no-cache", "Content-Encoding": "identity"}
     )
 
 class SystemData(BaseModel):
@@ -1080,8 +2919,13 @@ class SystemData(BaseModel):
     schedule: Optional[List[Dict[str, Any]]] = []
     coordinators: Optional[List[Dict[str, Any]]] = []
 
+system_data_adapter = TypeAdapter(SystemData)
+
 @api_router.get("/system/coordinators", response_model=SystemData)
-async def get_coordinator_data():
+async def get_coordinator_data(request: Request):
+    return await cached_json(request, "coordinators", load_coordinator_data)
+
+async def load_coordinator_data():
     data = await db.system.find_one({"type": "coordinator_data"}, {"_id": 0})
     if not data:
         # Default data structure if not found
@@ -1205,15 +3049,15 @@ async def get_coordinator_data():
             ]
         }
         await db.system.insert_one(default_data)
-        return SystemData(**default_data)
+        return serialize(system_data_adapter, default_data)
     
     # Force update if URL is outdated
     if data and "utsah.in" in data["rules"][0]:
         data["rules"][0] = "REGISTER ONLY THROUGH THE WEBSITE 'UTSAH2026' (utsahfest.in)."
         await db.system.replace_one({"type": "coordinator_data"}, data)
-        return SystemData(**data)
+        return serialize(system_data_adapter, data)
 
-    return SystemData(**data)
+    return serialize(system_data_adapter, data)
 
 @api_router.post("/system/coordinators", response_model=SystemData)
 async def update_coordinator_data(data: SystemData, admin: dict = Depends(get_admin_user)):
@@ -1221,20 +3065,269 @@ async def update_coordinator_data(data: SystemData, admin: dict = Depends(get_ad
     data_dict['type'] = "coordinator_data"
     
     await db.system.replace_one({"type": "coordinator_data"}, data_dict, upsert=True)
+    public_cache.invalidate("coordinators")
     return data
 
+# Cross-worker cache invalidation. Every worker keeps its own caches, so a
+# write handled by one worker is pushed to the others from a MongoDB change
+# stream over the cached collections, resuming from the last token after a
+# dropped connection. Without a replica set (CACHE_SYNC_MODE=auto falls back,
+# or =poll) each worker instead fingerprints the small collections every
+# CACHE_POLL_SECONDS; users are too large for that and rely on USER_CACHE_TTL.
+CACHE_SYNC_MODE = os.environ.get('CACHE_SYNC_MODE', 'auto')  # auto, changestream, poll or off
+CACHE_POLL_SECONDS = float(os.environ.get('CACHE_POLL_SECONDS', '10'))
+WATCHED_COLLECTIONS = ["events", "notifications", "system", "users", "gallery", "shortlists"]
+# What the polling fallback hashes; heavy or fast-changing fields are left out
+POLLED_COLLECTIONS = {
+    "events": {"registered_count": 0},
+    "notifications": {},
+    "system": {},
+    "gallery": {},
+    "shortlists": {"entries": 0},
+}
+CHANGE_STREAM_UNSUPPORTED = {40573, 40324, 115}  # not a replica set / unknown stage / not supported
+CHANGE_STREAM_EXPIRED = {260, 280, 286}  # resume token no longer usable
+cache_sync_stats = {"mode": None, "changes": 0, "invalidations": 0, "resumes": 0, "last_change_at": None, "last_error": None}
+
+def invalidate_local_caches(collection: str, document: Optional[dict] = None):
+    if collection == "events":
+        event_catalog.invalidate()
+    elif collection in ("notifications", "gallery", "shortlists"):
+        public_cache.invalidate(collection)
+    elif collection == "system":
+        sub_fest_limits_cache["expires"] = 0.0
+        public_cache.invalidate("coordinators")
+    elif collection == "users":
+        email = (document or {}).get("email")
+        if email:
+            user_cache.invalidate(email)
+        else:
+            user_cache.clear()
+    cache_sync_stats["invalidations"] += 1
+
+def invalidate_all_caches():
+    for collection in WATCHED_COLLECTIONS:
+        invalidate_local_caches(collection)
+
+# registered_count moves with every admission; the count refresher handles
+# it without reloading the whole catalog, so the server drops event updates
+# that touch nothing else before they reach any worker
+COUNT_ONLY_EVENT_UPDATE = {"$and": [
+    {"$eq": ["$ns.coll", "events"]},
+    {"$eq": ["$operationType", "update"]},
+    {"$eq": [{"$size": {"$filter": {
+        "input": {"$objectToArray": {"$ifNull": ["$updateDescription.updatedFields", {}]}},
+        "cond": {"$ne": ["$$this.k", "registered_count"]}
+    }}}, 0]},
+    {"$eq": [{"$size": {"$ifNull": ["$updateDescription.removedFields", []]}}, 0]},
+]}
+
+async def changed_user(change: dict) -> Optional[dict]:
+    # Inserts and replaces carry the document; for updates, look up the email
+    # here rather than asking the stream to fetch every changed document
+    if change.get("fullDocument") is not None or change["operationType"] != "update":
+        return change.get("fullDocument")
+    return await db.users.find_one({"_id": change["documentKey"]["_id"]}, {"_id": 0, "email": 1})
+
+async def watch_collections():
+    pipeline = [
+        {"$match": {"ns.coll": {"$in": WATCHED_COLLECTIONS}, "$expr": {"$not": [COUNT_ONLY_EVENT_UPDATE]}}},
+        {"$project": {"ns": 1, "operationType": 1, "documentKey": 1, "fullDocument.email": 1}},
+    ]
+    resume_token = None
+    delay = 1.0
+    while True:
+        try:
+            async with db.watch(pipeline, resume_after=resume_token) as stream:
+                cache_sync_stats["mode"] = "changestream"
+                if resume_token is None:
+                    # Anything before the stream opened may have been missed
+                    invalidate_all_caches()
+                async for change in stream:
+                    resume_token = stream.resume_token
+                    cache_sync_stats["changes"] += 1
+                    cache_sync_stats["last_change_at"] = datetime.now(timezone.utc).isoformat()
+                    delay = 1.0
+                    if change["operationType"] in ("drop", "dropDatabase", "rename", "invalidate"):
+                        invalidate_all_caches()
+                        if change["operationType"] == "invalidate":
+                            # The stream is closed for good; start a new one
+                            resume_token = None
+                            break
+                    elif change["ns"]["coll"] == "users":
+                        invalidate_local_caches("users", await changed_user(change))
+                    else:
+                        invalidate_local_caches(change["ns"]["coll"])
+        except OperationFailure as e:
+            if e.code in CHANGE_STREAM_UNSUPPORTED:
+                raise
+            if e.code in CHANGE_STREAM_EXPIRED:
+                resume_token = None
+            cache_sync_stats["last_error"] = str(e)
+            logger.warning(f"Change stream failed, reopening: {e}")
+        except PyMongoError as e:
+            cache_sync_stats["last_error"] = str(e)
+            logger.warning(f"Change stream interrupted, resuming: {e}")
+        cache_sync_stats["resumes"] += 1
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, 30.0)
+
+async def collection_fingerprint(collection: str, projection: dict) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    async for doc in db[collection].find({}, projection or None).sort("_id", 1):
+        digest.update(orjson.dumps(doc, default=str))
+    return digest.hexdigest()
+
+async def poll_collections():
+    cache_sync_stats["mode"] = "poll"
+    fingerprints = {}
+    while True:
+        try:
+            for collection, projection in POLLED_COLLECTIONS.items():
+                fingerprint = await collection_fingerprint(collection, projection)
+                previous = fingerprints.get(collection)
+                fingerprints[collection] = fingerprint
+                if previous is not None and previous != fingerprint:
+                    cache_sync_stats["changes"] += 1
+                    cache_sync_stats["last_change_at"] = datetime.now(timezone.utc).isoformat()
+                    invalidate_local_caches(collection)
+        except Exception as e:
+            cache_sync_stats["last_error"] = str(e)
+            logger.error(f"Cache poll failed: {e}")
+        await asyncio.sleep(CACHE_POLL_SECONDS)
+
+async def cache_sync_worker():
+    if CACHE_SYNC_MODE in ("auto", "changestream"):
+        try:
+            await watch_collections()
+        except OperationFailure as e:
+            if CACHE_SYNC_MODE == "changestream":
+                cache_sync_stats["last_error"] = str(e)
+                logger.error(f"Change streams unavailable, cross-worker cache invalidation is off: {e}")
+                return
+            logger.info(f"Change streams unavailable ({e.code}); polling for cache invalidation every {CACHE_POLL_SECONDS}s")
+    await poll_collections()
+
+# registered_count is kept by $inc on every admission; the reconciler checks
+# it against one $group over registrations and writes corrections in a
+# single bulk_write. With COUNT_RECONCILE_SECONDS > 0 it also runs in the
+# background. A seat reserved just before its registration is inserted looks
+# like drift for a moment, so the background pass only corrects an event
+# once the same drift has been seen on two consecutive runs. It defaults to
+# every 60s when registered_count is written behind, and off otherwise.
+COUNT_RECONCILE_SECONDS = float(os.environ.get('COUNT_RECONCILE_SECONDS', '60' if COUNT_WRITE_BEHIND else '0'))
+count_reconcile_stats = {
+    "runs": 0,
+    "last_run_at": None,
+    "events_checked": 0,
+    "drifted_events": 0,
+    "total_drift": 0,
+    "max_drift": 0,
+    "corrected_events": 0,
+    "last_error": None,
+}
+
+async def reconcile_event_counts(confirmed_drift: Optional[dict] = None) -> tuple:
+    actual = {
+        doc["_id"]: doc["count"]
+        async for doc in db.registrations.aggregate([{"$group": {"_id": "$event_id", "count": {"$sum": 1}}}])
+    }
+    drift = {}
+    ops = []
+    checked = 0
+    events = await db.events.find({}, {"_id": 0, "id": 1, "registered_count": 1, "counter_gen": 1}).to_list(None)
+    if COUNT_WRITE_BEHIND:
+        # Written-behind totals are the sum of the current seat slots, so
+        # compare against that where an event has slots
+        actual.update(await slot_totals({event["id"]: event.get("counter_gen", 0) for event in events}))
+    for event in events:
+        checked += 1
+        # None also matches events that never had the field
+        current = event.get("registered_count")
+        stored = current or 0
+        count = actual.get(event["id"], 0)
+        if stored == count:
+            continue
+        drift[event["id"]] = (stored, count)
+        if confirmed_drift is None or confirmed_drift.get(event["id"]) == (stored, count):
+            # Conditional on the value we read, so a concurrent $inc wins
+            ops.append(UpdateOne({"id": event["id"], "registered_count": current}, {"$set": {"registered_count": count}}))
+    
+    corrected = 0
+    if ops:
+        result = await db.events.bulk_write(ops, ordered=False)
+        corrected = result.modified_count
+        await event_catalog.refresh_counts()
+    
+    deltas = [abs(stored - count) for stored, count in drift.values()]
+    count_reconcile_stats.update({
+        "runs": count_reconcile_stats["runs"] + 1,
+        "last_run_at": datetime.now(timezone.utc).isoformat(),
+        "events_checked": checked,
+        "drifted_events": len(drift),
+        "total_drift": sum(deltas),
+        "max_drift": max(deltas, default=0),
+        "corrected_events": count_reconcile_stats["corrected_events"] + corrected,
+        "last_error": None,
+    })
+    return drift, corrected
+
+async def count_reconciler():
+    pending = {}
+    while True:
+        await asyncio.sleep(COUNT_RECONCILE_SECONDS)
+        try:
+            pending, corrected = await reconcile_event_counts(pending)
+            if pending:
+                logger.warning(f"registered_count drift on {len(pending)} event(s), corrected {corrected}: {pending}")
+        except Exception as e:
+            count_reconcile_stats["last_error"] = str(e)
+            logger.error(f"Count reconciliation failed: {e}")
+
 @api_router.post("/system/sync-counts")
 async def sync_event_counts(admin: dict = Depends(get_admin_user)):
-    events = await db.events.find({}).to_list(None)
-    updated = 0
-    for event in events:
-        eid = event['id']
-        actual = await db.registrations.count_documents({"event_id": eid})
-        if event.get('registered_count', 0) != actual:
-            await db.events.update_one({"id": eid}, {"$set": {"registered_count": actual}})
-            updated += 1
+    # Quota and seat counters reseed themselves from registrations on next use.
+    # Seat slots move to a new generation rather than being deleted under
+    # admissions that are still in flight (see recheck_seat).
+    await db.registration_quotas.delete_many({})
+    if SEAT_COUNTER_SHARDS > 1:
+        await reset_counter_slots({})
+    drift, updated = await reconcile_event_counts()
     return {"message": f"Synchronization complete. Updated {updated} events.", "updated_count": updated}
 
+@api_router.get("/system/diagnostics")
+async def get_diagnostics(admin: dict = Depends(get_admin_user)):
+    return {
+        "user_cache": user_cache.stats(),
+        "password_pool": {
+            **password_pool_stats,
+            "workers": PASSWORD_POOL_WORKERS,
+            "max_queue": PASSWORD_POOL_MAX_QUEUE,
+        },
+        "bcrypt": bcrypt_calibration,
+        "indexes": list(index_status.values()),
+        "file_disk_cache": disk_cache.stats(),
+        "stream": broadcaster.stats(),
+        "cache_sync": {**cache_sync_stats, "configured": CACHE_SYNC_MODE},
+        "count_reconciler": {**count_reconcile_stats, "interval_seconds": COUNT_RECONCILE_SECONDS},
+        "seat_counters": {
+            **counter_flush_stats,
+            "shards": SEAT_COUNTER_SHARDS,
+            "flush_seconds": COUNTER_FLUSH_SECONDS,
+            "pending_events": len(pending_count_events),
+        },
+        "event_catalog": {
+            "loaded": event_catalog.events is not None,
+            "events": len(event_catalog.events or []),
+            "version": event_catalog.version,
+        },
+        "email_outbox": {
+            **email_outbox_stats,
+            "pending": await db.email_outbox.count_documents({"status": {"$in": ["pending", "sending"]}}),
+            "budget_remaining": await email_budget_remaining(),
+        },
+    }
+
 # Include the router in the main app
 app.include_router(api_router)
 
@@ -1243,6 +3336,94 @@ app.include_router(api_router)
 # Configure logging
 
 
+@app.on_event("startup")
+async def calibrate_password_hashing():
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(password_executor, calibrate_bcrypt_rounds)
+
+@app.on_event("startup")
+async def ensure_indexes():
+    await bootstrap_indexes()
+
+# Keyset cursors and the live feed compare timestamps as BSON dates, and a
+# leftover ISO string sorts apart from every date, so unmigrated documents
+# would silently drop out of pages and deltas. The migration is checkpointed
+# and idempotent. It runs once, in the background, on whichever worker takes
+# the lease in db.migrations; finished collections are skipped. Set
+# TIMESTAMP_MIGRATION=off when migrate_datetimes.py runs as a release step.
+TIMESTAMP_MIGRATION = os.environ.get('TIMESTAMP_MIGRATION', 'startup')  # startup or off
+MIGRATION_LEASE = {**DATETIME_MIGRATION, "collection": "*lease*"}
+MIGRATION_LEASE_SECONDS = 600
+
+async def take_migration_lease(holder: str) -> bool:
+    # Also renews a lease this worker already holds
+    now = datetime.now(timezone.utc)
+    lease = {"holder": holder, "expires_at": now + timedelta(seconds=MIGRATION_LEASE_SECONDS)}
+    try:
+        await db.migrations.insert_one({**MIGRATION_LEASE, **lease})
+        return True
+    except DuplicateKeyError:
+        result = await db.migrations.update_one(
+            {**MIGRATION_LEASE, "$or": [{"holder": holder}, {"expires_at": {"$lt": now}}]},
+            {"$set": lease}
+        )
+        return bool(result.matched_count)
+
+async def migrate_legacy_timestamps():
+    try:
+        pending = await pending_collections(db)
+        if not pending:
+            return
+        holder = secrets.token_hex(8)
+        if not await take_migration_lease(holder):
+            logger.info("Another worker is migrating legacy timestamps")
+            return
+        try:
+            for collection in pending:
+                converted = await migrate_collection(db, collection, DATETIME_FIELDS[collection])
+                logger.info(f"Converted {converted} legacy timestamps in {collection}")
+                await take_migration_lease(holder)
+        finally:
+            await db.migrations.delete_one({**MIGRATION_LEASE, "holder": holder})
+    except Exception as e:
+        logger.error(f"Timestamp migration failed: {e}")
+
+@app.on_event("startup")
+async def start_timestamp_migration():
+    if TIMESTAMP_MIGRATION == "startup":
+        app.state.timestamp_migration_task = asyncio.create_task(migrate_legacy_timestamps())
+
+@app.on_event("startup")
+async def start_event_count_refresher():
+    app.state.event_count_task = asyncio.create_task(event_count_refresher())
+
+@app.on_event("startup")
+async def start_cache_sync():
+    if CACHE_SYNC_MODE != "off":
+        app.state.cache_sync_task = asyncio.create_task(cache_sync_worker())
+
+@app.on_event("startup")
+async def start_count_delta_flusher():
+    if COUNT_WRITE_BEHIND:
+        app.state.count_flush_task = asyncio.create_task(count_delta_flusher())
+
+@app.on_event("startup")
+async def start_count_reconciler():
+    if COUNT_RECONCILE_SECONDS > 0:
+        app.state.count_reconcile_task = asyncio.create_task(count_reconciler())
+
+@app.on_event("startup")
+async def start_email_outbox():
+    if EMAIL_OUTBOX_WORKER:
+        app.state.email_outbox_task = asyncio.create_task(email_outbox_worker())
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    client.close()
\ No newline at end of file
+    tasks = [getattr(app.state, name, None) for name in ("email_outbox_task", "timestamp_migration_task", "event_count_task", "count_reconcile_task", "count_flush_task", "cache_sync_task")]
+    for task in tasks:
+        if task:
+            task.cancel()
+    # Let the tasks finish cleanly, so the write-behind flusher pushes its last deltas
+    await asyncio.gather(*[task for task in tasks if task], return_exceptions=True)
+    client.close()
+    password_executor.shutdown(wait=False)
\ No newline at end of file
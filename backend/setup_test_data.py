@@ -1,7 +1,7 @@
 import asyncio
 from motor.motor_asyncio import AsyncIOMotorClient
 from passlib.context import CryptContext
-from datetime import datetime
+from datetime import datetime, timezone
 
 # Setup
 MONGO_URL = "mongodb://localhost:27017"
@@ -28,7 +28,7 @@ async def setup():
         "department": "ADMIN",
         "year": 4,
         "mobile_number": "9999999999",
-        "created_at": datetime.utcnow().isoformat()
+        "created_at": datetime.now(timezone.utc)
     }
     
     await db.users.update_one(
@@ -54,7 +54,7 @@ async def setup():
         "department": "CSE",
         "year": 2,
         "mobile_number": "8888888888",
-        "created_at": datetime.utcnow().isoformat()
+        "created_at": datetime.now(timezone.utc)
     }
     
     await db.users.update_one(
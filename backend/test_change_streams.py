@@ -0,0 +1,67 @@
+"""
+Live check for change-stream cache invalidation. Needs a MongoDB replica set;
+a throwaway single-node one is enough:
+
+    docker run -d --name utsah-rs -p 27017:27017 mongo:7 --replSet rs0 --bind_ip_all
+    docker exec utsah-rs mongosh --quiet --eval "rs.initiate()"
+    MONGO_URL="mongodb://localhost:27017/?directConnection=true" python test_change_streams.py
+
+Writes go to a scratch database (CHANGE_STREAM_TEST_DB) that is dropped afterwards.
+"""
+import os
+import asyncio
+from datetime import datetime, timezone
+from dotenv import load_dotenv
+
+load_dotenv()
+os.environ["DB_NAME"] = os.environ.get("CHANGE_STREAM_TEST_DB", "utsah_change_stream_test")
+
+import server
+
+async def wait_for(check, timeout=10.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not check():
+        if asyncio.get_running_loop().time() > deadline:
+            return False
+        await asyncio.sleep(0.05)
+    return True
+
+async def test_change_streams():
+    db = server.db
+    task = asyncio.create_task(server.cache_sync_worker())
+    try:
+        if not await wait_for(lambda: server.cache_sync_stats["mode"] is not None):
+            print("FAILED: cache sync worker did not start")
+            return
+        if server.cache_sync_stats["mode"] != "changestream":
+            print(f"FAILED: running in {server.cache_sync_stats['mode']} mode; is MONGO_URL a replica set?")
+            return
+        await asyncio.sleep(0.5)
+
+        server.public_cache.set("notifications", b"[]")
+        await db.notifications.insert_one({"id": "notif-check", "title": "t", "message": "m", "created_at": datetime.now(timezone.utc)})
+        ok = await wait_for(lambda: server.public_cache.get("notifications") is None)
+        print(f"{'SUCCESS' if ok else 'FAILED'}: notification insert invalidates the public cache")
+
+        server.user_cache.set("check@example.com", {"email": "check@example.com"})
+        await db.users.insert_one({"email": "check@example.com", "full_name": "Check"})
+        await db.users.update_one({"email": "check@example.com"}, {"$set": {"full_name": "Checked"}})
+        ok = await wait_for(lambda: server.user_cache.get("check@example.com") is None)
+        print(f"{'SUCCESS' if ok else 'FAILED'}: user update invalidates that user")
+
+        await db.events.insert_one({"id": "check-event", "registered_count": 0, "is_active": True})
+        await wait_for(lambda: server.event_catalog.events is None)
+        server.event_catalog.events = []
+        await db.events.update_one({"id": "check-event"}, {"$inc": {"registered_count": 1}})
+        await asyncio.sleep(1.0)
+        ok = server.event_catalog.events is not None
+        print(f"{'SUCCESS' if ok else 'FAILED'}: registered_count updates leave the catalog alone")
+
+        print(f"Stats: {server.cache_sync_stats}")
+    finally:
+        task.cancel()
+        await server.client.drop_database(os.environ["DB_NAME"])
+        server.client.close()
+
+if __name__ == "__main__":
+    asyncio.run(test_change_streams())